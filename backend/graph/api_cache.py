@@ -0,0 +1,111 @@
+"""
+Persistent Cache for Google Maps API Responses
+
+Stores raw API responses in a small SQLite database keyed by the API method
+and its arguments, so repeat lookups (the same city, place, or distance pair)
+are served from disk instead of the network across process restarts.
+
+Each entry records when it was inserted and is treated as stale after a TTL
+(30 days by default), after which the next lookup goes back to the API.
+Recently used entries are also kept decoded in memory, so repeat lookups
+within a process skip both the SQLite query and the JSON decode.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional: values are (de)serialized with the stdlib json module
+    orjson = None
+
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+# Decoded entries kept in memory (least recently used are evicted first)
+MEMORY_CACHE_SIZE = 4096
+
+
+class ApiCache:
+    """
+    SQLite-backed key/value store for JSON-serializable API responses.
+
+    Safe to share between threads: all access goes through one connection
+    guarded by a lock.
+
+    Attributes:
+        path: SQLite database file
+        ttl: Seconds an entry stays valid
+        memory_size: Number of decoded entries kept in memory
+    """
+
+    def __init__(self, path: str = "gmaps_cache.sqlite", ttl: float = DEFAULT_TTL_SECONDS,
+                 memory_size: int = MEMORY_CACHE_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self._lock = threading.Lock()
+        # key -> (value, inserted_at), in least- to most-recently-used order
+        self._memory = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " inserted_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(method: str, args=(), kwargs=None) -> str:
+        """Build a stable cache key from an API method name and its arguments."""
+        return json.dumps([method, list(args), kwargs or {}], sort_keys=True, default=str)
+
+    def get(self, key: str):
+        """Return the cached response for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                row = self._conn.execute(
+                    "SELECT value, inserted_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, inserted_at = row
+                value = orjson.loads(value) if orjson is not None else json.loads(value)
+                entry = (value, inserted_at)
+                self._remember(key, entry)
+        value, inserted_at = entry
+        if time.time() - inserted_at > self.ttl:
+            return None
+        return value
+
+    def set(self, key: str, value):
+        """Store a response under key, replacing any previous entry."""
+        encoded = orjson.dumps(value).decode("utf-8") if orjson is not None else json.dumps(value)
+        inserted_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, inserted_at) VALUES (?, ?, ?)",
+                (key, encoded, inserted_at)
+            )
+            self._conn.commit()
+            self._remember(key, (value, inserted_at))
+
+    def _remember(self, key: str, entry):
+        """Keep a decoded entry in memory, evicting the least recently used. Caller holds the lock."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
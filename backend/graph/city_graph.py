@@ -2,17 +2,173 @@
 import os
 import math
 import json
-from typing import Dict, Tuple, Optional
-from dotenv import load_dotenv
+import re
+import random
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Union
+import numpy as np
 
-# Load environment variables from .env file
-load_dotenv()
+from api_cache import ApiCache
+from graph_store import GraphStore
+import heuristics
+from heuristics import EARTH_RADIUS_MILES, MILES_PER_DEGREE
+
+# googlemaps (and requests/urllib3 behind it) is imported on first use by
+# _import_googlemaps(), so importing this module stays cheap
+googlemaps = None
 
 try:
-    import googlemaps
+    import orjson
 except ImportError:
-    print("ERROR: googlemaps not installed. Run: pip install googlemaps")
-    googlemaps = None
+    # orjson is optional: the stdlib json module is used for the cache instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack is optional: the graph is then cached as JSON only
+    msgpack = None
+
+try:
+    import aiohttp
+except ImportError:
+    # aiohttp is optional: without it Places lookups use a thread pool
+    aiohttp = None
+
+# Distance Matrix API per-request limits
+MAX_MATRIX_ORIGINS = 25
+MAX_MATRIX_DESTINATIONS = 25
+MAX_MATRIX_ELEMENTS = 100
+
+METERS_PER_MILE = 1609.34
+
+# Share of straight-line distance (vs. shortest edge) in weighted_heuristic
+WEIGHTED_HEURISTIC_ALPHA = 0.7
+
+# Non-adjacent network cities farther apart than this (straight line) are not connected
+MAX_EDGE_MILES = 200
+
+# Shared read-only default for adjacency lookups of cities with no edges yet
+_NO_NEIGHBORS = MappingProxyType({})
+
+# Concurrency for independent Google Maps requests, kept under the QPS quota
+API_MAX_WORKERS = 10
+# Keep-alive pool for the googlemaps client's requests.Session
+API_POOL_CONNECTIONS = 20
+API_POOL_MAXSIZE = 50
+API_CALLS_PER_SECOND = 50
+# Exponential backoff when the API reports throttling (HTTP 429 / OVER_QUERY_LIMIT)
+API_MAX_RETRIES = 5
+API_BACKOFF_SECONDS = 0.5
+API_MAX_BACKOFF_SECONDS = 60
+# Places web service used directly by AsyncCityGraph
+PLACES_API_URL = "https://maps.googleapis.com/maps/api/place"
+ASYNC_MAX_CONNECTIONS = 20
+
+
+# Trailing "..., NY, USA" / "..., ON, Canada" of a plus code or vicinity
+REGION_PATTERN = re.compile(r",\s*([A-Z]{2}),\s*(USA|Canada)\s*$")
+COUNTRY_CODES = {"USA": "US", "Canada": "CA"}
+
+
+def _import_googlemaps():
+    """Import the googlemaps module on first use; returns None if it is not installed."""
+    global googlemaps
+    if googlemaps is None:
+        try:
+            import googlemaps as module
+        except ImportError:
+            print("ERROR: googlemaps not installed. Run: pip install googlemaps")
+            return None
+        googlemaps = module
+    return googlemaps
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(data, pretty: bool = False) -> bytes:
+    """Serialize data to compact (or, if pretty, indented) JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(path: str, payload: bytes):
+    """Write payload to a temporary file and rename it over path, so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+POPULAR_CITIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "popular_cities.json")
+
+
+def _load_popular_cities() -> Dict[str, Tuple[float, float]]:
+    """Load pre-geocoded coordinates for frequently routed US/CA cities."""
+    try:
+        with open(POPULAR_CITIES_FILE, 'rb') as f:
+            return {name: tuple(coords) for name, coords in _json_loads(f.read()).items()}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load popular cities: {e}")
+        return {}
+
+
+# Hub cities seeded into every graph so they never need geocoding
+POPULAR_CITIES = _load_popular_cities()
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that spaces out API calls.
+    
+    Use as a context manager around each request; entering blocks until the
+    call fits within max_calls per period.
+    """
+    
+    def __init__(self, max_calls: int, period: float = 1.0):
+        self.capacity = max_calls
+        self.rate = max_calls / period
+        self._tokens = float(max_calls)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+    
+    def acquire(self):
+        """Block until another call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
 
 
 class CityGraph:
@@ -28,8 +184,25 @@ class CityGraph:
         cities: Dict mapping city names to (latitude, longitude) tuples
         graph: Dict mapping city names to dicts of neighbors and distances
         cache_file: JSON file for caching API results
+        snapshot_file: Binary (msgpack) graph snapshot, preferred over cache_file
+        store_file: SQLite log of cities/edges added since the last snapshot
+        api_cache_file: SQLite file caching raw Google Maps responses
+        lock: Re-entrant lock guarding the in-memory graph. Cities and edges
+            are added, and the CSR arrays rebuilt, while holding it (never
+            across an API call); hold it around a search so the graph can't
+            change underneath it
     """
     
+    # Fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        'api_key', 'cache_file', 'snapshot_file', 'store_file', 'api_cache_file',
+        'cities', 'graph', 'directed', 'intermediate_cities', 'lock',
+        'gmaps', '_api_cache', '_store', '_limiter', '_aliases', '_min_edge',
+        '_city_index', '_lat', '_lon', '_h_index', '_h_rows',
+        '_node_index', '_node_names', '_indptr', '_indices', '_weights', '_neighbor_names',
+        '_dense',
+    )
+    
     def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
         """
         Initialize the city graph with Google Maps API.
@@ -43,6 +216,9 @@ class CityGraph:
         """
         # Get API key
         if api_key is None:
+            # Load environment variables from .env file
+            from dotenv import load_dotenv
+            load_dotenv()
             api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         
         if not api_key:
@@ -53,59 +229,355 @@ class CityGraph:
         
         self.api_key = api_key
         self.cache_file = "city_graph_cache.json"
+        self.snapshot_file = "city_graph_cache.msgpack"
+        self.store_file = "city_graph.sqlite"
+        self.api_cache_file = "gmaps_cache.sqlite"
         self.cities = {}
         self.graph = {}
         self.directed = False
         self.intermediate_cities = []  # Add this line
+        self.lock = threading.RLock()
+        # Canonical name -> stored city key, so spelling variants share one entry
+        self._aliases = {}
+        self._limiter = RateLimiter(API_CALLS_PER_SECOND)
+        # Latitude/longitude (radians) as parallel NumPy arrays for vectorized
+        # distance math; rebuilt lazily after self.cities changes (None means stale)
+        self._city_index = {}
+        self._lat = None
+        self._lon = None
+        # Pairwise straight-line distances among the current network's cities
+        # (row/column per name), so haversine_distance is a table lookup there
+        self._h_index = {}
+        self._h_rows = []
+        # CSR adjacency (indptr/indices/weights) mirroring self.graph;
+        # rebuilt by _finalize_graph() after edges change (None means stale)
+        self._node_index = {}
+        self._node_names = []
+        self._indptr = None
+        self._indices = None
+        self._weights = None
+        # Neighbor names per city as shared tuples, rebuilt alongside the CSR arrays
+        self._neighbor_names = {}
+        # Dense node x node edge matrix, built on demand from the CSR arrays
+        self._dense = None
+        # Shortest edge per city, kept current as edges are added
+        self._min_edge = {}
         # Initialize Google Maps client
         print("Initializing Google Maps client...")
-        if googlemaps is None:
+        if _import_googlemaps() is None:
             raise ImportError("googlemaps library required. Run: pip install googlemaps")
-        self.gmaps = googlemaps.Client(key=api_key)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        # One keep-alive session for every API call; the default pool (10) is
+        # smaller than our worker count, so it is sized up. Dropped connections
+        # are retried with a short backoff (HTTP errors are retried by googlemaps)
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=API_POOL_CONNECTIONS, pool_maxsize=API_POOL_MAXSIZE,
+            max_retries=Retry(total=3, backoff_factor=0.2))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.gmaps = googlemaps.Client(key=api_key, requests_session=session)
+        # Raw API responses are cached on disk so repeat lookups skip the network
+        self._api_cache = ApiCache(self.api_cache_file) if use_cache else None
+        # New cities and edges are persisted one row at a time as they are added
+        self._store = GraphStore(self.store_file) if use_cache else None
         
         # Try to load from cache first
-        if use_cache and os.path.exists(self.cache_file):
-            # print(f"Loading cached city data from {self.cache_file}...")
+        if use_cache:
             self._load_from_cache()
         else:
             print("Ready to add cities dynamically via add_city()")
+        
+        # Seed hub cities that are not already known
+        for name, coords in POPULAR_CITIES.items():
+            if self.resolve_city(name) not in self.cities:
+                self.cities[name] = coords
+                self._register_alias(name)
+        self._lat = None
+        
+        heuristics.warm_up()
     
     def _load_from_cache(self):
-        """Load cached city and graph data from JSON file."""
+        """
+        Load cached city and graph data from the snapshot or JSON file, then
+        apply the cities and edges recorded in the store since.
+        """
         try:
-            with open(self.cache_file, 'r') as f:
-                data = json.load(f)
-                self.cities = data.get("cities", {})
-                self.graph = data.get("graph", {})
+            data = self._read_saved()
+            self.cities = data.get("cities", {})
+            self.graph = data.get("graph", {})
+            if self._store is not None:
+                self._apply_store_rows(*self._store.load())
+            for name in self.cities:
+                self._register_alias(name)
+            self._min_edge = {city: min(neighbors.values())
+                              for city, neighbors in self.graph.items() if neighbors}
+            self._lat = None
+            self._finalize_graph()
             print(f"✓ Loaded {len(self.cities)} cities from cache")
         except Exception as e:
             print(f"Error loading cache: {e}. Will fetch fresh data.")
             self.cities = {}
             self.graph = {}
+            self._aliases = {}
+            self._min_edge = {}
+    
+    def _apply_store_rows(self, store_cities, store_edges):
+        """Apply cities and edges read from the store over the in-memory graph."""
+        self.cities.update(store_cities)
+        # Group edges per city first so each adjacency dict is built or
+        # extended in one call instead of growing one key at a time
+        adjacency = defaultdict(list)
+        for city1, city2, distance in store_edges:
+            adjacency[city1].append((city2, distance))
+            adjacency[city2].append((city1, distance))
+        for city, edges in adjacency.items():
+            neighbors = self.graph.get(city)
+            if neighbors is None:
+                self.graph[city] = dict(edges)
+            else:
+                neighbors.update(edges)
+    
+    def _merge_saved(self, saved: dict, store_rows):
+        """
+        Fold another process's work into the in-memory graph before a save:
+        the on-disk snapshot fills in cities and edges missing here, then the
+        store's rows (newer than any snapshot) are applied on top.
+        """
+        for name, coords in saved.get("cities", {}).items():
+            if name not in self.cities:
+                self.cities[name] = coords
+        for city, neighbors in saved.get("graph", {}).items():
+            mine = self.graph.get(city)
+            self.graph[city] = {**neighbors, **mine} if mine else dict(neighbors)
+        if store_rows is not None:
+            self._apply_store_rows(*store_rows)
+        for name in self.cities:
+            self._register_alias(name)
+        self._min_edge = {city: min(neighbors.values())
+                          for city, neighbors in self.graph.items() if neighbors}
+        self._lat = None
+        self._indptr = None
+    
+    def _read_saved(self) -> dict:
+        """
+        Parse the msgpack snapshot if there is one (and msgpack is installed),
+        else the JSON cache; {} if neither exists.
+        
+        Only data formats are read: nothing loaded from the working directory
+        can run code.
+        """
+        if msgpack is not None and os.path.exists(self.snapshot_file):
+            return self._read_snapshot()
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, 'rb') as f:
+                return _json_loads(f.read())
+        return {}
     
-    def _save_to_cache(self):
-        """Save city and graph data to JSON file for future use."""
+    def save_cache(self, pretty: bool = False):
+        """
+        Save city and graph data for future use (msgpack snapshot if available,
+        else JSON), folding in and clearing the incremental store.
+        
+        New cities and edges are already persisted by the store as they are
+        added, so this only needs to run occasionally (e.g. at shutdown).
+        
+        Processes sharing the files (uvicorn workers) each hold their own
+        graph, so the current snapshot and store rows are merged in first and
+        only the store rows read here are cleared: whichever process saves
+        last, nothing another one found is lost.
+        
+        Args:
+            pretty: Write indented JSON (for debugging) instead of compact JSON
+        """
         try:
-            data = {
-                "cities": self.cities,
-                "graph": self.graph
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            print(f"✓ Saved city data to {self.cache_file}")
+            # Read the store before the snapshot: rows another process clears
+            # in between are then already in the snapshot it wrote
+            store_rows = self._store.load() if self._store is not None else None
+            saved = self._read_saved()
+            with self.lock:
+                self._merge_saved(saved, store_rows)
+                if msgpack is not None:
+                    path, payload = self.snapshot_file, self._snapshot_bytes()
+                else:
+                    data = {
+                        "cities": self.cities,
+                        "graph": self.graph
+                    }
+                    path, payload = self.cache_file, _json_dumps(data, pretty)
+            _write_atomic(path, payload)
+            if self._store is not None:
+                self._store.clear(store_rows)
+            print(f"✓ Saved city data to {path}")
         except Exception as e:
             print(f"Warning: Could not save cache: {e}")
     
+    def _snapshot_bytes(self) -> bytes:
+        """Pack cities plus the CSR edge arrays (as raw binary) with msgpack."""
+        self._finalize_graph()
+        return msgpack.packb({
+            "cities": self.cities,
+            "nodes": self._node_names,
+            "indptr": self._indptr.tobytes(),
+            "indices": self._indices.tobytes(),
+            "weights": self._weights.tobytes()
+        })
+    
+    def _read_snapshot(self) -> dict:
+        """Unpack a msgpack snapshot into the same {"cities", "graph"} shape as the JSON cache."""
+        with open(self.snapshot_file, 'rb') as f:
+            data = msgpack.unpackb(f.read())
+        nodes = data["nodes"]
+        indptr = np.frombuffer(data["indptr"], dtype=np.int32).tolist()
+        indices = np.frombuffer(data["indices"], dtype=np.int32).tolist()
+        weights = np.frombuffer(data["weights"], dtype=np.float64).tolist()
+        graph = {}
+        for i, name in enumerate(nodes):
+            start, end = indptr[i], indptr[i + 1]
+            graph[name] = {nodes[j]: w for j, w in zip(indices[start:end], weights[start:end])}
+        return {"cities": data["cities"], "graph": graph}
+    
+    def _cached_call(self, method: str, *args, **kwargs):
+        """
+        Call a Google Maps client method, serving repeat requests from the API cache.
+        
+        Args:
+            method: Name of the googlemaps.Client method (e.g. "geocode")
+            *args, **kwargs: Arguments forwarded to that method
+        
+        Returns:
+            The API response, from the cache when a fresh entry exists
+        """
+        return self._cached_request(ApiCache.make_key(method, args, kwargs), method, *args, **kwargs)
+    
+    def _cached_request(self, key: str, method: str, *args, **kwargs):
+        """Like _cached_call, but stores the response under an explicit cache key."""
+        if self._api_cache is not None:
+            cached = self._api_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        with self._limiter:
+            result = getattr(self.gmaps, method)(*args, **kwargs)
+        
+        if self._api_cache is not None:
+            self._api_cache.set(key, result)
+        return result
+    
+    @staticmethod
+    def _canonical(name: str) -> str:
+        """Normalize a city name for matching, e.g. 'Buffalo , NY' -> 'buffalo,ny'."""
+        return ",".join(" ".join(part.split()).lower() for part in name.split(","))
+    
+    def _register_alias(self, city_name: str):
+        """Record city_name as the stored key for its canonical form (first one wins)."""
+        self._aliases.setdefault(self._canonical(city_name), city_name)
+    
+    def resolve_city(self, city_name: str) -> str:
+        """
+        Map a city name to the key it is stored under.
+        
+        Args:
+            city_name: City name in any casing/spacing, e.g. 'buffalo, ny'
+        
+        Returns:
+            The existing key for that city, or city_name unchanged if unknown
+        """
+        if city_name in self.cities:
+            return city_name
+        return self._aliases.get(self._canonical(city_name), city_name)
+    
+    def _cached_geocode(self, city_name: str):
+        """Geocode a city, cached under its canonical name so spelling variants share an entry."""
+        key = ApiCache.make_key("geocode", [self._canonical(city_name)])
+        return self._cached_request(key, "geocode", city_name)
+    
+    def _distance_key(self, city1: str, city2: str) -> str:
+        """API cache key for the driving distance of one undirected city pair."""
+        return ApiCache.make_key("distance", sorted((self._canonical(city1), self._canonical(city2))))
+    
+    def _cached_distance(self, city1: str, city2: str) -> Optional[float]:
+        """Previously fetched driving distance in miles for a pair, or None."""
+        if self._api_cache is None:
+            return None
+        return self._api_cache.get(self._distance_key(city1, city2))
+    
+    def _cache_distance(self, city1: str, city2: str, distance: float):
+        """Remember a pair's driving distance independently of how it was requested."""
+        if self._api_cache is not None:
+            self._api_cache.set(self._distance_key(city1, city2), distance)
+    
     def add_city(self, city_name: str):
         """Dynamically add a city by geocoding it."""
+        if self._add_known_city(city_name):
+            return True
         try:
-            geocode_result = self.gmaps.geocode(city_name)
+            geocode_result = self._cached_geocode(city_name)
+        except Exception as e:
+            geocode_result = e
+        return self._add_geocoded_city(city_name, geocode_result)
+    
+    def add_cities_bulk(self, city_names: List[str]) -> int:
+        """
+        Add many cities, geocoding the unknown ones concurrently.
+        
+        Args:
+            city_names: City names; known cities and spelling variants are
+                resolved without an API call
+        
+        Returns:
+            Number of distinct cities now present in the graph
+        """
+        unique = {}
+        for name in city_names:
+            unique.setdefault(self._canonical(name), name)
+        pending = [name for name in unique.values() if not self._add_known_city(name)]
+        
+        def geocode(name):
+            try:
+                return self._cached_geocode(name)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=API_MAX_WORKERS) as executor:
+            results = list(executor.map(geocode, pending))
+        
+        # Responses are recorded on this thread, so the graph is never mutated concurrently
+        added = sum(self._add_geocoded_city(name, result) for name, result in zip(pending, results))
+        return len(unique) - len(pending) + added
+    
+    def _add_known_city(self, city_name: str) -> bool:
+        """Ensure an already-known city (cached, seeded or a spelling variant) has a graph entry."""
+        known_name = self.resolve_city(city_name)
+        if known_name not in self.cities:
+            return False
+        with self.lock:
+            if known_name not in self.graph:
+                self.graph[known_name] = {}
+                self._indptr = None
+        return True
+    
+    def _add_geocoded_city(self, city_name: str, geocode_result) -> bool:
+        """Record a city from its geocode response (or the exception raised fetching it)."""
+        try:
+            if isinstance(geocode_result, Exception):
+                raise geocode_result
             if geocode_result:
                 location = geocode_result[0]['geometry']['location']
                 lat, lng = location['lat'], location['lng']
                 formatted_name = geocode_result[0]['formatted_address']
-                self.cities[city_name] = (lat, lng)
-                self.graph[city_name] = {}
+                with self.lock:
+                    self.cities[city_name] = (lat, lng)
+                    self.graph[city_name] = {}
+                    self._register_alias(city_name)
+                    # Google's own spelling (e.g. 'Buffalo, NY, USA') also finds this city
+                    self._register_alias(formatted_name)
+                    self._lat = None
+                    self._indptr = None
+                if self._store is not None:
+                    self._store.add_city(city_name, lat, lng)
                 print(f"✓ Added {city_name}")
                 print(f"  Location: {formatted_name}")
                 print(f"  Coords: ({lat:.4f}, {lng:.4f})")
@@ -117,26 +589,53 @@ class CityGraph:
             print(f"✗ {city_name}: Error - {e}")
             return False
     
+    def _fetch_distance(self, city1: str, city2: str) -> Optional[float]:
+        """Query the Distance Matrix API for a single pair. Returns miles or None."""
+        cached = self._cached_distance(city1, city2)
+        if cached is not None:
+            return cached
+        result = self._cached_call(
+            "distance_matrix",
+            origins=[city1],
+            destinations=[city2],
+            mode="driving",
+            units="imperial"
+        )
+        element = result['rows'][0]['elements'][0]
+        if element['status'] == 'OK':
+            distance = element['distance']['value'] / METERS_PER_MILE
+            self._cache_distance(city1, city2, distance)
+            return distance
+        return None
+
+    def _set_edge(self, city1: str, city2: str, distance: float):
+        """Store an undirected edge and keep both cities' minimum edge current."""
+        with self.lock:
+            for a, b in ((city1, city2), (city2, city1)):
+                neighbors = self.graph.setdefault(a, {})
+                replaced = neighbors.get(b)
+                neighbors[b] = distance
+                if replaced is not None and replaced == self._min_edge.get(a):
+                    # The old minimum may have been this edge; recompute it
+                    self._min_edge[a] = min(neighbors.values())
+                else:
+                    self._min_edge[a] = min(self._min_edge.get(a, math.inf), distance)
+            self._indptr = None
+        if self._store is not None:
+            self._store.add_edge(city1, city2, distance)
+    
     def connect_cities(self, city1: str, city2: str):
         """Add connection between two cities with real distance."""
         try:
             # Make sure both cities exist in graph
-            if city1 not in self.graph:
-                self.graph[city1] = {}
-            if city2 not in self.graph:
-                self.graph[city2] = {}
+            with self.lock:
+                self.graph.setdefault(city1, {})
+                self.graph.setdefault(city2, {})
             
-            result = self.gmaps.distance_matrix(
-                origins=[city1],
-                destinations=[city2],
-                mode="driving",
-                units="imperial"
-            )
+            distance = self._fetch_distance(city1, city2)
             
-            if result['rows'][0]['elements'][0]['status'] == 'OK':
-                distance = result['rows'][0]['elements'][0]['distance']['value'] / 1609.34
-                self.graph[city1][city2] = distance
-                self.graph[city2][city1] = distance
+            if distance is not None:
+                self._set_edge(city1, city2, distance)
                 print(f"✓ {city1} ↔ {city2}: {distance:.0f} miles")
                 return True
             else:
@@ -145,10 +644,190 @@ class CityGraph:
         except Exception as e:
             print(f"✗ Error: {e}")
             return False
+
+    @staticmethod
+    def _plan_matrix_requests(pairs):
+        """
+        Group (origin, destination) pairs into Distance Matrix sized requests.
+        
+        Origins are packed greedily while the union of their destinations keeps
+        the request within the API limits, so a chain of "connect to the next
+        few cities" pairs needs only a handful of requests.
+        
+        Returns:
+            List of (origins, destinations) tuples
+        """
+        by_origin = {}
+        for origin, destination in pairs:
+            by_origin.setdefault(origin, {})[destination] = None
+        
+        batches = []
+        origins, destinations = [], {}
+        for origin, targets in by_origin.items():
+            merged = {**destinations, **targets}
+            fits = (len(origins) + 1 <= MAX_MATRIX_ORIGINS
+                    and len(merged) <= MAX_MATRIX_DESTINATIONS
+                    and (len(origins) + 1) * len(merged) <= MAX_MATRIX_ELEMENTS)
+            if fits:
+                origins.append(origin)
+                destinations = merged
+                continue
+            if origins:
+                batches.append((origins, list(destinations)))
+            # A single origin with too many targets is split across requests;
+            # the last chunk stays open for the following origins
+            step = min(MAX_MATRIX_DESTINATIONS, MAX_MATRIX_ELEMENTS)
+            remaining = iter(targets)
+            chunks = list(iter(lambda: list(islice(remaining, step)), []))
+            for chunk in chunks[:-1]:
+                batches.append(([origin], chunk))
+            origins, destinations = [origin], dict.fromkeys(chunks[-1])
+        if origins:
+            batches.append((origins, list(destinations)))
+        return batches
+
+    def connect_cities_batch(self, pairs):
+        """
+        Connect many city pairs using batched Distance Matrix requests.
+        
+        Instead of one HTTP round-trip per edge, pairs are tiled into requests
+        of up to 25 origins x 25 destinations (100 elements), which are sent
+        concurrently; only the requested pairs are written to the graph.
+        
+        Args:
+            pairs: List of (city1, city2) tuples to connect. Edges are undirected,
+                so reversed duplicates and self-pairs are dropped
+        
+        Returns:
+            Number of pairs successfully connected
+        """
+        wanted = {}
+        for city1, city2 in pairs:
+            if city1 != city2 and (city2, city1) not in wanted:
+                wanted[(city1, city2)] = None
+        pairs = list(wanted)
+        with self.lock:
+            for city1, city2 in pairs:
+                self.graph.setdefault(city1, {})
+                self.graph.setdefault(city2, {})
+            self._indptr = None
+        
+        # Pairs whose distance is already known need no matrix element at all
+        connected = 0
+        misses = []
+        for city1, city2 in pairs:
+            distance = self._cached_distance(city1, city2)
+            if distance is None:
+                misses.append((city1, city2))
+                continue
+            self._set_edge(city1, city2, distance)
+            connected += 1
+            print(f"✓ {city1} ↔ {city2}: {distance:.0f} miles")
+        
+        def fetch(batch):
+            origins, destinations = batch
+            try:
+                return self._cached_call(
+                    "distance_matrix",
+                    origins=origins,
+                    destinations=destinations,
+                    mode="driving",
+                    units="imperial"
+                )
+            except Exception as e:
+                return e
+        
+        batches = self._plan_matrix_requests(misses)
+        with ThreadPoolExecutor(max_workers=API_MAX_WORKERS) as executor:
+            results = list(executor.map(fetch, batches))
+        
+        # Responses are recorded on this thread, so the graph is never mutated concurrently.
+        # Merged batches also return cells nobody asked for (or already served
+        # from the cache): only outstanding misses are recorded, each once
+        outstanding = set(misses)
+        for (origins, destinations), result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"✗ Error: {result}")
+                continue
+            
+            for i, city1 in enumerate(origins):
+                elements = result['rows'][i]['elements']
+                for j, city2 in enumerate(destinations):
+                    if (city1, city2) not in outstanding:
+                        continue
+                    outstanding.discard((city1, city2))
+                    element = elements[j]
+                    if element['status'] != 'OK':
+                        print(f"✗ {city1} ↔ {city2}: Could not get distance")
+                        continue
+                    distance = element['distance']['value'] / METERS_PER_MILE
+                    self._set_edge(city1, city2, distance)
+                    self._cache_distance(city1, city2, distance)
+                    connected += 1
+                    print(f"✓ {city1} ↔ {city2}: {distance:.0f} miles")
+        return connected
+    
+    def _nearby_places(self, search_points):
+        """
+        Run places_nearby for every (lat, lon) search point concurrently.
+        
+        Returns:
+            List of API responses aligned with search_points; a failed search
+            yields the raised exception instead of a response
+        """
+        def search(point):
+            try:
+                return self._cached_call(
+                    "places_nearby",
+                    location=point,
+                    radius=80000,  # 80km radius
+                    type='locality'
+                )
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=API_MAX_WORKERS) as executor:
+            return list(executor.map(search, search_points))
     
+    def _place_details(self, place_ids):
+        """
+        Fetch address components for many places concurrently.
+        
+        Returns:
+            Dict mapping place_id to the API response (or the raised exception)
+        """
+        def lookup(place_id):
+            try:
+                return self._cached_call(
+                    "place",
+                    place_id=place_id,
+                    fields=['address_component']
+                )
+            except Exception as e:
+                return e
         
-      
-      
+        unique_ids = list(dict.fromkeys(place_ids))
+        with ThreadPoolExecutor(max_workers=API_MAX_WORKERS) as executor:
+            return dict(zip(unique_ids, executor.map(lookup, unique_ids)))
+    
+    @staticmethod
+    def _region_from_place(place) -> Optional[Tuple[str, str]]:
+        """
+        Read the state and country of a nearby-search result without a details call.
+        
+        Args:
+            place: One entry of a places_nearby response
+        
+        Returns:
+            (state, country) short codes such as ('NY', 'US'), or None if neither
+            the plus code nor the vicinity ends in a recognizable region
+        """
+        for text in (place.get('plus_code', {}).get('compound_code', ''), place.get('vicinity', '')):
+            match = REGION_PATTERN.search(text)
+            if match:
+                return match.group(1), COUNTRY_CODES[match.group(2)]
+        return None
+    
     def find_intermediate_cities(self, start_city: str, goal_city: str, num_cities):
         """
         IMPROVED VERSION:
@@ -195,21 +874,40 @@ class CityGraph:
             print(f"  📍 Route spans: {start_state} → {goal_state}")
             
             intermediate_cities = []
+            # O(1) duplicate check; start and goal must never be picked as intermediates
+            seen = {start_city, goal_city}
             print(f"num_cities:{num_cities}\n")
+            
+            # Invariant across all candidates: names to skip and the route's bounding box
+            start_name = start_city.split(",")[0].strip().lower()
+            goal_name = goal_city.split(",")[0].strip().lower()
+            lat_min, lat_max = min(start_lat, goal_lat), max(start_lat, goal_lat)
+            lon_min, lon_max = min(start_lon, goal_lon), max(start_lon, goal_lon)
+            tolerance = 3 if abs(goal_lat - start_lat) > 2 else 1
+            
+            # Search points evenly spaced along the straight line start → goal
+            search_points = []
             for i in range(1, num_cities + 1):
+                t = i / (num_cities + 1)
+                search_points.append((start_lat + (goal_lat - start_lat) * t,
+                                      start_lon + (goal_lon - start_lon) * t))
+            
+            # Issue all nearby searches, then all place-detail lookups, concurrently
+            nearby_results = self._nearby_places(search_points)
+            # Details are only needed where the region can't be read from the result itself
+            place_ids = [place['place_id']
+                         for result in nearby_results if isinstance(result, dict)
+                         for place in result.get('results', [])[:5]
+                         if place.get('place_id') and self._region_from_place(place) is None]
+            place_details = self._place_details(place_ids)
+            
+            for i, (search_lat, search_lon) in enumerate(search_points, start=1):
                 try:
-                    t = i / (num_cities + 1)
-                    search_lat = start_lat + (goal_lat - start_lat) * t
-                    search_lon = start_lon + (goal_lon - start_lon) * t
-                    
                     print(f"\n  🔎 Search point {i}/{num_cities}: ({search_lat:.4f}, {search_lon:.4f})")
                     
-                    # Search for cities near this point
-                    places_result = self.gmaps.places_nearby(
-                        location=(search_lat, search_lon),
-                        radius=80000,  # 80km radius
-                        type='locality'
-                    )
+                    places_result = nearby_results[i - 1]
+                    if isinstance(places_result, Exception):
+                        raise places_result
                     
                     if not places_result.get('results'):
                         print(f"No places found at this point")
@@ -225,26 +923,26 @@ class CityGraph:
 
                             if not place_id: continue
                             
-                            start_name = start_city.split(",")[0].strip().lower()
-                            goal_name = goal_city.split(",")[0].strip().lower() 
-                            
                             print(f"      Checking: {city_name}...", end=" ")
                             if city_name.lower() == start_name or city_name.lower() == goal_name:
                                 print("(is start/goal city)")
                                 continue
 
-                            # Fetch full place details using place_id
-                            details_result = self.gmaps.place(
-                                place_id=place_id, 
-                                fields=['address_component']
-                            )
                             found_state = None
                             found_country = None 
-                            for component in details_result['result']['address_components']:
-                                if 'administrative_area_level_1' in component['types']:
-                                    found_state = component['short_name'].strip()
-                                if 'country' in component['types']:
-                                    found_country = component['short_name'].strip()
+                            region = self._region_from_place(place)
+                            if region:
+                                found_state, found_country = region
+                            else:
+                                # Full place details were prefetched by place_id
+                                details_result = place_details[place_id]
+                                if isinstance(details_result, Exception):
+                                    raise details_result
+                                for component in details_result['result']['address_components']:
+                                    if 'administrative_area_level_1' in component['types']:
+                                        found_state = component['short_name'].strip()
+                                    if 'country' in component['types']:
+                                        found_country = component['short_name'].strip()
 
                             if found_country not in ['US', 'CA']:
                                 print(f"(skipping country: {found_country})")
@@ -260,25 +958,32 @@ class CityGraph:
                                 # Fallback for places with no admin level 1 (shouldn't happen for locality)
                                 full_city = f"{city_name}, {found_country}"
                             
-                            if full_city in intermediate_cities:
+                            full_city = self.resolve_city(full_city)
+                            if full_city in seen:
                                 print(f"(duplicate: {full_city})")
                                 continue
 
                             
 
+                            # Bounds check on the search result's own location first, so
+                            # off-route candidates are rejected before any geocoding
+                            location = place.get('geometry', {}).get('location')
+                            if location and not (lat_min - tolerance <= location['lat'] <= lat_max + tolerance
+                                                 and lon_min - tolerance <= location['lng'] <= lon_max + tolerance):
+                                print(f"(off route)")
+                                continue
+
                             if self.add_city(full_city):
                                 city_coords = self.get_coordinates(full_city)
                                 if city_coords:
                                     city_lat, city_lon = city_coords
-                                    lat_min, lat_max = min(start_lat, goal_lat), max(start_lat, goal_lat)
-                                    lon_min, lon_max = min(start_lon, goal_lon), max(start_lon, goal_lon)
-                                    tolerance = 3 if abs(goal_lat - start_lat) > 2 else 1
                                     lat_in_range = lat_min - tolerance <= city_lat <= lat_max + tolerance
                                     lon_in_range = lon_min - tolerance <= city_lon <= lon_max + tolerance
                                     
                                     if not (lat_in_range and lon_in_range):
                                         print(f"(off route)")
                                         continue
+                                    seen.add(full_city)
                                     intermediate_cities.append(full_city)
                                     print(f"    ✓ ADDED: {full_city}")
                                     break  # Move to the next search point
@@ -293,8 +998,6 @@ class CityGraph:
                     continue
             
             print(f"\n✅ Found {len(intermediate_cities)} intermediate cities:")
-            # for city in intermediate_cities:
-            #     print(f"   - {city}")
             
             return intermediate_cities[:num_cities]
         
@@ -305,7 +1008,8 @@ class CityGraph:
             return []
 
  
-    def build_dynamic_network(self, start_city: str, goal_city: str, num_intermediate: int = 25):
+    def build_dynamic_network(self, start_city: str, goal_city: str, num_intermediate: int = 25,
+                              max_edge_miles: Optional[float] = MAX_EDGE_MILES):
         """
         Build a dynamic network by finding intermediate cities and connecting nearby ones.
         
@@ -313,21 +1017,22 @@ class CityGraph:
             start_city: Starting city
             goal_city: Goal city
             num_intermediate: Number of intermediate cities to find
+            max_edge_miles: Skip non-consecutive pairs farther apart than this
+                (straight line); None connects every candidate pair
         """
         print(f"\n🌍 Building dynamic network from {start_city} to {goal_city}...")
         
         # Add start and goal if not present
-        if start_city not in self.get_all_cities():
-            self.add_city(start_city)
-        if goal_city not in self.get_all_cities():
-            self.add_city(goal_city)
+        self.add_cities_bulk([start_city, goal_city])
         
         # Find intermediate cities
         intermediate = self.find_intermediate_cities(start_city, goal_city, num_intermediate)
         self.intermediate_cities= intermediate
+        cities = self.cities
+        graph = self.graph
         # Add all intermediate cities
         for city in intermediate:
-            if city not in self.get_all_cities():
+            if city not in cities:
                 self.add_city(city)
         
         # Build ordered list: start → intermediate → goal
@@ -335,11 +1040,25 @@ class CityGraph:
         
         # Connect nearby cities (create multiple paths)
         print(f"\n🔗 Connecting nearby cities...")
+        # Straight-line distances screen out pairs not worth a Distance Matrix lookup;
+        # consecutive cities are always connected so the chain stays intact
+        straight = self.haversine_pairwise(all_cities)
+        # Exact distances whichever network published them last, so a
+        # concurrent build replacing the table never changes a search's answers
+        with self.lock:
+            self._h_index = {city: i for i, city in enumerate(all_cities) if city in cities}
+            self._h_rows = straight.tolist()
+        pairs = []
         for i, city1 in enumerate(all_cities):
+            neighbors = graph.get(city1, _NO_NEIGHBORS)
             # Connect to next few cities (create multiple paths)
-            for city2 in all_cities[i+1:i+4]:  # Connect to next 3 cities
-                if city2 not in self.get_neighbors(city1):
-                    self.connect_cities(city1, city2)
+            for j, city2 in enumerate(all_cities[i+1:i+4], start=i+1):  # Connect to next 3 cities
+                if j > i + 1 and max_edge_miles is not None and straight[i, j] > max_edge_miles:
+                    continue
+                if city2 not in neighbors:
+                    pairs.append((city1, city2))
+        self.connect_cities_batch(pairs)
+        self._finalize_graph()
         
         print(f"✓ Network built with {len(all_cities)} cities")
         return all_cities, intermediate
@@ -354,7 +1073,105 @@ class CityGraph:
         Returns:
             Dict mapping neighbor city names to distances
         """
-        return self.graph.get(city, {})
+        neighbors = self.graph.get(city)
+        if neighbors is None:
+            # Spelling variants are only resolved on a miss, keeping exact keys fast
+            neighbors = self.graph.get(self.resolve_city(city), {})
+        return neighbors
+    
+    def _finalize_graph(self):
+        """
+        Build CSR arrays from self.graph for contiguous neighbor iteration.
+        
+        Node i's neighbors are self._indices[self._indptr[i]:self._indptr[i+1]],
+        with matching edge distances in the same slice of self._weights.
+        """
+        with self.lock:
+            # Neighbors without an adjacency entry of their own become degree-0 nodes
+            nodes = dict.fromkeys(self.graph)
+            for neighbors in self.graph.values():
+                nodes.update(dict.fromkeys(neighbors))
+            self._node_names = list(nodes)
+            self._node_index = {name: i for i, name in enumerate(self._node_names)}
+            
+            degrees = [len(self.graph.get(name, ())) for name in self._node_names]
+            indptr = np.zeros(len(degrees) + 1, dtype=np.int32)
+            np.cumsum(degrees, out=indptr[1:])
+            
+            index = self._node_index
+            self._indices = np.fromiter(
+                (index[name] for neighbors in self.graph.values() for name in neighbors),
+                dtype=np.int32, count=indptr[-1])
+            self._weights = np.fromiter(
+                (distance for neighbors in self.graph.values() for distance in neighbors.values()),
+                dtype=np.float64, count=indptr[-1])
+            self._neighbor_names = {city: tuple(neighbors) for city, neighbors in self.graph.items()}
+            self._dense = None
+            self._indptr = indptr
+    
+    def get_neighbor_names(self, city: str) -> Tuple[str, ...]:
+        """
+        Get the names of a city's neighbors without copying them.
+        
+        Args:
+            city: City name
+        
+        Returns:
+            Tuple of neighbor names, shared between calls (empty if unknown)
+        """
+        if self._indptr is None:
+            self._finalize_graph()
+        return self._neighbor_names.get(city, ())
+    
+    def get_neighbors_csr(self, city: Union[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get neighbor indices and distances for a city as zero-copy array views.
+        
+        Args:
+            city: City name, or its node index (as returned in a previous
+                call's neighbor indices)
+        
+        Returns:
+            Tuple of (neighbor indices into self._node_names, distances in miles);
+            both empty if the city is not in the graph
+        """
+        if self._indptr is None:
+            self._finalize_graph()
+        if isinstance(city, str):
+            i = self._node_index.get(city)
+        else:
+            i = int(city) if 0 <= city < len(self._node_names) else None
+        if i is None:
+            return self._indices[:0], self._weights[:0]
+        return self.get_neighbors_ids(i)
+    
+    def get_neighbors_ids(self, node_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get neighbor indices and distances for a valid node index (see node_id),
+        skipping the name lookup and range checks of get_neighbors_csr.
+        
+        Args:
+            node_id: Node index of a city in the current CSR arrays
+        
+        Returns:
+            Tuple of (neighbor node indices, distances in miles) as array views
+        """
+        if self._indptr is None:
+            self._finalize_graph()
+        start, end = self._indptr[node_id], self._indptr[node_id + 1]
+        return self._indices[start:end], self._weights[start:end]
+    
+    def node_id(self, city: str) -> Optional[int]:
+        """Node index of a city in the CSR arrays, or None if it has no edges."""
+        if self._indptr is None:
+            self._finalize_graph()
+        return self._node_index.get(city)
+    
+    def node_name(self, node_id: int) -> str:
+        """City name for a node index returned by node_id or get_neighbors_ids."""
+        if self._indptr is None:
+            self._finalize_graph()
+        return self._node_names[node_id]
     
     def get_distance(self, city1: str, city2: str) -> Optional[float]:
         """
@@ -367,7 +1184,34 @@ class CityGraph:
         Returns:
             Distance in miles, or None if not directly connected
         """
-        return self.graph.get(city1, {}).get(city2, None)
+        neighbors = self.graph.get(city1)
+        if neighbors is None:
+            neighbors = self.graph.get(self.resolve_city(city1), _NO_NEIGHBORS)
+        distance = neighbors.get(city2)
+        if distance is None and neighbors:
+            distance = neighbors.get(self.resolve_city(city2))
+        return distance
+    
+    def dense_distances(self) -> np.ndarray:
+        """
+        Direct edge distances between all graph nodes as one dense matrix.
+        
+        Rows and columns are node ids (see node_id). Memory grows with the
+        square of the node count, so this is meant for network-sized graphs,
+        where whole-graph checks become array operations.
+        
+        Returns:
+            (N, N) float32 array of miles, np.inf where there is no direct edge
+        """
+        if self._indptr is None:
+            self._finalize_graph()
+        if self._dense is None:
+            n = len(self._node_names)
+            dense = np.full((n, n), np.inf, dtype=np.float32)
+            rows = np.repeat(np.arange(n), np.diff(self._indptr))
+            dense[rows, self._indices] = self._weights
+            self._dense = dense
+        return self._dense
     
     def get_coordinates(self, city: str) -> Optional[Tuple[float, float]]:
         """
@@ -379,7 +1223,10 @@ class CityGraph:
         Returns:
             Tuple of (latitude, longitude)
         """
-        return self.cities.get(city)
+        coords = self.cities.get(city)
+        if coords is None:
+            coords = self.cities.get(self.resolve_city(city))
+        return coords
     
     def haversine_distance(self, city1: str, city2: str) -> float:
         """
@@ -393,66 +1240,207 @@ class CityGraph:
         Returns:
             Approximate distance in miles
         """
+        # Both cities in the current network: precomputed by build_dynamic_network
+        i = self._h_index.get(city1)
+        if i is not None:
+            j = self._h_index.get(city2)
+            if j is not None:
+                return self._h_rows[i][j]
+        
         coords1 = self.get_coordinates(city1)
         coords2 = self.get_coordinates(city2)
         
         if not coords1 or not coords2:
             return 0
         
-        lat1, lon1 = coords1
-        lat2, lon2 = coords2
+        # Compiled Haversine kernel (see heuristics.py), memoized per coordinate pair
+        return heuristics.haversine_cached(coords1[0], coords1[1], coords2[0], coords2[1])
+    
+    def _coordinate_arrays(self):
+        """
+        Return (city_index, lat, lon), rebuilding them if cities changed.
+        
+        Latitudes and longitudes are separate contiguous float32 arrays in
+        radians, followed by one zero sentinel so that index -1 (an unknown
+        city) is always valid. float32 halves memory traffic for the
+        vectorized distances; its error (well under 0.01 mile at these
+        ranges) is negligible next to driving distances.
+        """
+        with self.lock:
+            if self._lat is None:
+                self._city_index = {name: i for i, name in enumerate(self.cities)}
+                coords = np.zeros((len(self.cities) + 1, 2), dtype=np.float32)
+                if self.cities:
+                    coords[:-1] = np.radians(list(self.cities.values()))
+                self._lat = np.ascontiguousarray(coords[:, 0])
+                self._lon = np.ascontiguousarray(coords[:, 1])
+            return self._city_index, self._lat, self._lon
+    
+    def haversine_matrix(self, cities: List[str], goal: Optional[str] = None) -> np.ndarray:
+        """
+        Straight-line distance from every city in cities to goal, computed in
+        one vectorized pass instead of one haversine_distance call per city.
+        
+        Args:
+            cities: City names
+            goal: Goal city name. If None, returns all pairwise distances
+                among cities (see haversine_pairwise)
+        
+        Returns:
+            NumPy array of distances in miles aligned with cities
+            (0 for unknown cities, matching haversine_distance)
+        """
+        if goal is None:
+            return self.haversine_pairwise(cities)
+        index = self._coordinate_arrays()[0]
+        idxs = np.array([index.get(city, -1) for city in cities], dtype=np.intp)
+        # Unknown cities gather the sentinel slot, which is 0
+        return self._haversine_to(goal)[idxs]
+    
+    def haversine_all_to(self, goal: str) -> np.ndarray:
+        """
+        Straight-line distance from every known city to goal in one vectorized pass.
+        
+        Args:
+            goal: Goal city name
         
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+        Returns:
+            NumPy array of distances in miles, one per city in self.cities
+            order (all 0 if goal is unknown)
+        """
+        return self._haversine_to(goal)[:-1]
+    
+    def _haversine_to(self, goal: str) -> np.ndarray:
+        """Distances from every coordinate slot to goal, including a trailing 0 for the sentinel."""
+        index, lat, lon = self._coordinate_arrays()
+        goal_idx = index.get(goal)
+        if goal_idx is None:
+            return np.zeros(len(lat))
         
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        c = 2 * math.asin(math.sqrt(a))
+        lat2, lon2 = lat[goal_idx], lon[goal_idx]
+        dlat = lat2 - lat
+        dlon = lon2 - lon
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+        distances = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0))) * EARTH_RADIUS_MILES
+        distances[-1] = 0.0
+        return distances
+    
+    def haversine_pairwise(self, cities: List[str]) -> np.ndarray:
+        """
+        Straight-line distances between every pair of cities, as one broadcast
+        computation.
         
-        # Earth's radius in miles
-        r = 3959
+        Args:
+            cities: City names
+        
+        Returns:
+            (N, N) NumPy array of distances in miles; rows and columns of
+            unknown cities are 0, matching haversine_distance
+        """
+        index, all_lat, all_lon = self._coordinate_arrays()
+        idxs = np.array([index.get(city, -1) for city in cities], dtype=np.intp)
+        known = idxs >= 0
+        lat = all_lat[idxs]
+        lon = all_lon[idxs]
         
-        return c * r
+        dlat = lat[None, :] - lat[:, None]
+        dlon = lon[None, :] - lon[:, None]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        
+        return np.where(known[:, None] & known[None, :], c * EARTH_RADIUS_MILES, 0.0)
     
-
+    def _planar_offsets_to(self, cities: List[str], goal: str):
+        """
+        Vectorized heuristics.planar_offsets from every city in cities to goal.
+        
+        Returns:
+            (dx, dy, known): east-west and north-south offsets in miles, and a
+            mask of cities that (with the goal) have coordinates
+        """
+        index, lat, lon = self._coordinate_arrays()
+        goal_idx = index.get(goal, -1)
+        idxs = np.array([index.get(city, -1) for city in cities], dtype=np.intp)
+        miles_per_radian = MILES_PER_DEGREE * 180 / math.pi
+        lat1 = lat[idxs]
+        lat2 = lat[goal_idx]
+        dy = (lat2 - lat1) * miles_per_radian
+        dx = (lon[goal_idx] - lon[idxs]) * miles_per_radian * np.cos((lat1 + lat2) / 2)
+        known = (idxs >= 0) & (goal_idx >= 0)
+        return dx, dy, known
+    
+    def euclidean_matrix(self, cities: List[str], goal: str) -> np.ndarray:
+        """
+        Euclidean distance from every city in cities to goal in one pass.
+        
+        Returns:
+            NumPy array in miles aligned with cities (0 for unknown cities,
+            matching euclidean_distance)
+        """
+        dx, dy, known = self._planar_offsets_to(cities, goal)
+        return np.where(known, np.hypot(dx, dy), 0.0)
+    
+    def manhattan_matrix(self, cities: List[str], goal: str) -> np.ndarray:
+        """
+        Manhattan distance from every city in cities to goal in one pass.
+        
+        Returns:
+            NumPy array in miles aligned with cities (0 for unknown cities,
+            matching manhattan_distance)
+        """
+        dx, dy, known = self._planar_offsets_to(cities, goal)
+        return np.where(known, np.abs(dx) + np.abs(dy), 0.0)
+    
+    def weighted_matrix(self, cities: List[str], goal: str) -> np.ndarray:
+        """
+        weighted_heuristic from every city in cities to goal in one pass.
+        
+        Returns:
+            NumPy array in miles aligned with cities
+        """
+        min_edge = np.fromiter((self._min_edge.get(city, 0) for city in cities),
+                               dtype=np.float64, count=len(cities))
+        alpha = WEIGHTED_HEURISTIC_ALPHA
+        return alpha * self.haversine_matrix(cities, goal) + (1 - alpha) * min_edge
     
     def euclidean_distance(self, city1: str, city2: str) -> float:
-        """Euclidean distance"""
-        lat1, lon1 = self.get_coordinates(city1)
-        lat2, lon2 = self.get_coordinates(city2)
-        if not (lat1 and lon2):
+        """Euclidean distance (0 if either city is unknown, like haversine_distance)"""
+        coords1 = self.get_coordinates(city1)
+        coords2 = self.get_coordinates(city2)
+        if coords1 is None or coords2 is None:
             return 0
-        # Approximate: 1 degree latitude ≈ 69 miles
-        return ((lat2 - lat1)**2 + (lon2 - lon1)**2)**0.5 * 69
+        return heuristics.euclidean_cached(coords1[0], coords1[1], coords2[0], coords2[1])
     
     def manhattan_distance(self, city1: str, city2: str) -> float:
-        """Manhattan distance (taxicab metric)"""
-        lat1, lon1 = self.get_coordinates(city1)
-        lat2, lon2 = self.get_coordinates(city2)
-        if not (lat1 and lon2):
+        """Manhattan distance (taxicab metric; 0 if either city is unknown)"""
+        coords1 = self.get_coordinates(city1)
+        coords2 = self.get_coordinates(city2)
+        if coords1 is None or coords2 is None:
             return 0
-        return (abs(lat2 - lat1) + abs(lon2 - lon1)) * 69
+        return heuristics.manhattan_cached(coords1[0], coords1[1], coords2[0], coords2[1])
     
     def min_graph_distance(self, city1: str, city2: str) -> float:
         """Minimum cost edge from current city"""
-        neighbors = self.get_neighbors(city1)
-        if not neighbors:
-            return 0
-        return min(neighbors.values())
+        return self._min_edge.get(city1, 0)
     
     def weighted_heuristic(self, city1: str, city2: str) -> float:
         """Weighted combination of heuristics"""
         h_distance = self.haversine_distance(city1, city2)
         h_graph = self.min_graph_distance(city1, city2)
-        alpha = 0.7  # 70% distance, 30% graph
+        alpha = WEIGHTED_HEURISTIC_ALPHA  # 70% distance, 30% graph
         return alpha * h_distance + (1 - alpha) * h_graph
 
 
     def get_all_cities(self):
-        """Return list of all cities in the graph."""
-        return list(self.cities.keys())
+        """
+        Return all cities in the graph as a live keys view (O(1) membership,
+        no copy); wrap in list() if a snapshot is needed.
+        """
+        return self.cities.keys()
+    
+    def __contains__(self, city: str) -> bool:
+        """True if city is a node of the graph (exact name; see resolve_city)."""
+        return city in self.cities
     
     def __repr__(self):
         """String representation showing number of cities and edges."""
@@ -460,13 +1448,109 @@ class CityGraph:
         return f"CityGraph({len(self.cities)} cities, {num_edges} connections)"
 
 
-def initialize_city_graph(api_key: Optional[str] = None, use_cache: bool = True) -> CityGraph:
+class AsyncCityGraph(CityGraph):
+    """
+    CityGraph that issues the Places lookups of find_intermediate_cities with
+    aiohttp over one shared connection pool instead of blocking googlemaps calls.
+    
+    The public interface stays synchronous: each batch of lookups runs in its
+    own event loop via asyncio.run(), so it must not be called from a thread
+    that is already running a loop. Responses share the API cache and rate
+    limiter with CityGraph; throttled requests are retried with exponential
+    backoff, as the googlemaps client does for CityGraph.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
+        if aiohttp is None:
+            raise ImportError("aiohttp library required. Run: pip install aiohttp")
+        super().__init__(api_key=api_key, use_cache=use_cache)
+    
+    async def _places_request(self, session, method: str, endpoint: str, **params):
+        """
+        Call a Places web service endpoint, serving repeat requests from the API cache.
+        
+        Args:
+            session: Open aiohttp.ClientSession
+            method: Matching googlemaps.Client method name, so cache keys are shared
+            endpoint: Places endpoint (e.g. "nearbysearch")
+            **params: Request parameters, as passed to the googlemaps method
+        
+        Returns:
+            The decoded response body
+        """
+        key = ApiCache.make_key(method, (), params)
+        if self._api_cache is not None:
+            cached = self._api_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        query = {name: ",".join(map(str, value)) if isinstance(value, (list, tuple)) else value
+                 for name, value in params.items()}
+        query["key"] = self.api_key
+        
+        for attempt in range(API_MAX_RETRIES + 1):
+            delay = self._limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            async with session.get(f"{PLACES_API_URL}/{endpoint}/json", params=query) as response:
+                if response.status == 429:
+                    result = {"status": "OVER_QUERY_LIMIT"}
+                else:
+                    response.raise_for_status()
+                    result = await response.json()
+            if result.get("status") != "OVER_QUERY_LIMIT" or attempt == API_MAX_RETRIES:
+                break
+            
+            # Throttled: back off exponentially, with jitter so retries don't arrive together
+            backoff = min(API_BACKOFF_SECONDS * 2 ** attempt, API_MAX_BACKOFF_SECONDS)
+            await asyncio.sleep(backoff * (random.random() + 0.5))
+        
+        if result.get("status") not in ("OK", "ZERO_RESULTS"):
+            raise googlemaps.exceptions.ApiError(result.get("status"), result.get("error_message"))
+        
+        if self._api_cache is not None:
+            self._api_cache.set(key, result)
+        return result
+    
+    async def _gather_places(self, method: str, endpoint: str, param_list):
+        """Run one Places request per params dict concurrently; failures are returned, not raised."""
+        connector = aiohttp.TCPConnector(limit=ASYNC_MAX_CONNECTIONS)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await asyncio.gather(
+                *(self._places_request(session, method, endpoint, **params) for params in param_list),
+                return_exceptions=True
+            )
+    
+    def _nearby_places(self, search_points):
+        """Run places_nearby for every (lat, lon) search point concurrently."""
+        return asyncio.run(self._gather_places(
+            "places_nearby", "nearbysearch",
+            [{"location": point, "radius": 80000, "type": 'locality'} for point in search_points]
+        ))
+    
+    def _place_details(self, place_ids):
+        """Fetch address components for many places concurrently."""
+        unique_ids = list(dict.fromkeys(place_ids))
+        results = asyncio.run(self._gather_places(
+            "place", "details",
+            [{"place_id": place_id, "fields": ['address_component']} for place_id in unique_ids]
+        ))
+        return dict(zip(unique_ids, results))
+
+
+def initialize_city_graph(api_key: Optional[str] = None, use_cache: bool = True,
+                          async_http: Optional[bool] = None) -> CityGraph:
     """
     Initialize the global city graph instance.
     
     Args:
         api_key: Google Maps API key (optional, reads from environment if not provided)
         use_cache: Use cached data if available
+        async_http: Use AsyncCityGraph for Places lookups. If None, uses it
+            whenever aiohttp is installed
     
     Returns:
         Initialized CityGraph instance
@@ -476,4 +1560,7 @@ def initialize_city_graph(api_key: Optional[str] = None, use_cache: bool = True)
         >>> graph = initialize_city_graph()
         >>> print(graph)
     """
-    return CityGraph(api_key=api_key, use_cache=use_cache)
\ No newline at end of file
+    if async_http is None:
+        async_http = aiohttp is not None
+    graph_class = AsyncCityGraph if async_http else CityGraph
+    return graph_class(api_key=api_key, use_cache=use_cache)
\ No newline at end of file
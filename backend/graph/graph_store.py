@@ -0,0 +1,109 @@
+"""
+Incremental Persistence for the City Graph
+
+Records every geocoded city and every connected edge in a small SQLite
+database as it is added, so the graph survives restarts without rewriting a
+full JSON/msgpack snapshot after each change. Writes are single-row upserts
+(O(1) per mutation); CityGraph.save_cache() folds the rows into a
+snapshot and clears them.
+
+Several processes (e.g. uvicorn workers) may share one store, so clear()
+can be limited to the rows a save actually read: rows another process
+records in the meantime are kept for the next save.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class GraphStore:
+    """
+    SQLite-backed append log of graph mutations.
+
+    Safe to share between threads: all access goes through one connection
+    guarded by a lock.
+
+    Attributes:
+        path: SQLite database file
+    """
+
+    def __init__(self, path: str = "city_graph.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cities ("
+            " name TEXT PRIMARY KEY,"
+            " lat REAL NOT NULL,"
+            " lon REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS edges ("
+            " src TEXT NOT NULL,"
+            " dst TEXT NOT NULL,"
+            " miles REAL NOT NULL,"
+            " PRIMARY KEY (src, dst))"
+        )
+
+    def add_city(self, name: str, lat: float, lon: float):
+        """Record a city's coordinates, replacing any previous entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cities (name, lat, lon) VALUES (?, ?, ?)",
+                (name, lat, lon)
+            )
+
+    def add_edge(self, src: str, dst: str, miles: float):
+        """Record an undirected edge, replacing any previous distance."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO edges (src, dst, miles) VALUES (?, ?, ?)",
+                (src, dst, miles)
+            )
+
+    def load(self) -> Tuple[Dict[str, Tuple[float, float]], List[Tuple[str, str, float]]]:
+        """
+        Read back everything recorded so far.
+
+        Returns:
+            (cities, edges): dict of name -> (lat, lon) and a list of
+            (src, dst, miles) edges, each to be applied in both directions
+        """
+        with self._lock:
+            cities = {name: (lat, lon) for name, lat, lon in
+                      self._conn.execute("SELECT name, lat, lon FROM cities")}
+            edges = self._conn.execute("SELECT src, dst, miles FROM edges").fetchall()
+        return cities, edges
+
+    def clear(self, rows: Optional[Tuple[Dict[str, Tuple[float, float]], List[Tuple[str, str, float]]]] = None):
+        """
+        Drop recorded rows (after they have been folded into a snapshot).
+
+        Args:
+            rows: (cities, edges) as returned by load(); only rows still
+                holding exactly those values are dropped, so anything recorded
+                since (e.g. by another process) is kept. None drops every row.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            if rows is None:
+                self._conn.execute("DELETE FROM cities")
+                self._conn.execute("DELETE FROM edges")
+            else:
+                cities, edges = rows
+                self._conn.executemany(
+                    "DELETE FROM cities WHERE name = ? AND lat = ? AND lon = ?",
+                    [(name, lat, lon) for name, (lat, lon) in cities.items()]
+                )
+                self._conn.executemany(
+                    "DELETE FROM edges WHERE src = ? AND dst = ? AND miles = ?", edges
+                )
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
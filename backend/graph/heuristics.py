@@ -0,0 +1,94 @@
+"""
+Distance Kernels for Search Heuristics
+
+Scalar great-circle (Haversine) and flat-projection (Euclidean, Manhattan)
+distances between two (latitude, longitude) points, in miles. The kernels are
+compiled with Numba when it is installed (cached on disk, so later processes
+skip compilation) and run as plain Python otherwise.
+
+CityGraph uses the memoized *_cached wrappers for one-off heuristic values;
+whole-graph tables are computed with NumPy in CityGraph itself.
+"""
+
+import math
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+EARTH_RADIUS_MILES = 3959
+# Miles per degree of latitude; a degree of longitude shrinks by cos(latitude)
+MILES_PER_DEGREE = 69
+
+# Memoized heuristic evaluations kept per metric (keyed by coordinates)
+HEURISTIC_CACHE_SIZE = 4096
+
+
+@njit(cache=True, fastmath=True)
+def haversine_rad(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles between two points given in radians."""
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    # Rounding (and fastmath) can push a just outside [0, 1]: clamp as the vectorized path does
+    a = min(max(a, 0.0), 1.0)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+@njit(cache=True, fastmath=True)
+def haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles between two points given in degrees."""
+    return haversine_rad(math.radians(lat1), math.radians(lon1),
+                         math.radians(lat2), math.radians(lon2))
+
+
+@njit(cache=True, fastmath=True)
+def planar_offsets(lat1, lon1, lat2, lon2):
+    """East-west and north-south offsets in miles, longitude scaled at the mean latitude."""
+    dy = (lat2 - lat1) * MILES_PER_DEGREE
+    dx = (lon2 - lon1) * MILES_PER_DEGREE * math.cos(math.radians((lat1 + lat2) / 2))
+    return dx, dy
+
+
+@njit(cache=True, fastmath=True)
+def euclidean(lat1, lon1, lat2, lon2):
+    """Straight-line distance in miles on a local flat projection."""
+    dx, dy = planar_offsets(lat1, lon1, lat2, lon2)
+    return math.sqrt(dx * dx + dy * dy)
+
+
+@njit(cache=True, fastmath=True)
+def manhattan(lat1, lon1, lat2, lon2):
+    """Taxicab distance in miles on a local flat projection."""
+    dx, dy = planar_offsets(lat1, lon1, lat2, lon2)
+    return abs(dx) + abs(dy)
+
+
+def warm_up():
+    """Call each compiled kernel once so JIT compilation (or loading it from the
+    on-disk cache) happens at startup rather than in the first search."""
+    haversine(0.0, 0.0, 1.0, 1.0)
+    euclidean(0.0, 0.0, 1.0, 1.0)
+    manhattan(0.0, 0.0, 1.0, 1.0)
+
+
+# A* re-evaluates the same (node, goal) pair many times; these memoize the
+# kernels on coordinates, so results never go stale if a city is re-geocoded
+@lru_cache(maxsize=HEURISTIC_CACHE_SIZE)
+def haversine_cached(lat1, lon1, lat2, lon2):
+    return haversine(lat1, lon1, lat2, lon2)
+
+
+@lru_cache(maxsize=HEURISTIC_CACHE_SIZE)
+def euclidean_cached(lat1, lon1, lat2, lon2):
+    return euclidean(lat1, lon1, lat2, lon2)
+
+
+@lru_cache(maxsize=HEURISTIC_CACHE_SIZE)
+def manhattan_cached(lat1, lon1, lat2, lon2):
+    return manhattan(lat1, lon1, lat2, lon2)
@@ -13,28 +13,61 @@ Uses the search algorithms from the course's search.py module with instrumentati
 
 import time
 import sys
-import os
+import heapq
+from itertools import count
 
 
 # Import from professor's search framework
 # Make sure search.py and utils.py are in the same directory
 try:
-    from search import (
-        Node, 
-        uniform_cost_search,
-        astar_search,
-        greedy_best_first_graph_search,
-        depth_first_graph_search,
-        InstrumentedProblem
-    )
+    from search import Node
 except ImportError as e:
-    # print(f"Error: Could not import from search.py. Make sure search.py and utils.py are in this directory.")
     print(f"Error details: {e}")
     sys.exit(1)
 
 from route_problem import RouteOptimizationProblem
 
 
+class CountingProblem:
+    """
+    Lightweight replacement for search.InstrumentedProblem.
+    
+    Only actions() is wrapped, once per expansion: every action is expanded
+    into exactly one successor, so len(actions) gives the same successor
+    count InstrumentedProblem accumulates one result() call at a time. The
+    other hot methods are bound straight to the wrapped problem.
+    
+    Attributes:
+        problem: The wrapped problem
+        states: Number of successor nodes generated
+    """
+    
+    def __init__(self, problem):
+        self.problem = problem
+        self.states = 0
+        # Insertion-ordered set of expanded states
+        self._expanded = {}
+        self.initial = problem.initial
+        self.goal = problem.goal
+        self.result = problem.result
+        self.goal_test = problem.goal_test
+        self.path_cost = problem.path_cost
+    
+    def actions(self, state):
+        self._expanded[state] = None
+        actions = self.problem.actions(state)
+        self.states += len(actions)
+        return actions
+    
+    @property
+    def expanded_states(self):
+        """Expanded states in first-expansion order, without repeats."""
+        return list(self._expanded)
+    
+    def __getattr__(self, attr):
+        return getattr(self.problem, attr)
+
+
 class AlgorithmResult:
     """
     Contains the results of running a search algorithm.
@@ -47,6 +80,9 @@ class AlgorithmResult:
         execution_time_ms: Time taken in milliseconds
         success: Whether goal was reached
     """
+    __slots__ = ('algorithm_name', 'path', 'path_cost', 'nodes_expanded',
+                 'expanded_states', 'execution_time_ms', 'success')
+    
     def __init__(self, algorithm_name, path=None, path_cost=0, 
                  nodes_expanded=0, expanded_states=0, execution_time_ms=0, success=False):
         self.algorithm_name = algorithm_name
@@ -76,6 +112,18 @@ class RouteOptimizer:
     search.py functions with instrumentation.
     """
     
+    # Result key -> runner, in the order run_all_algorithms reports them
+    ALGORITHMS = {
+        "ucs": lambda p: RouteOptimizer.uniform_cost_search(p),
+        "astar_haversine": lambda p: RouteOptimizer.astar_search(p, 'haversine'),
+        "astar_euclidean": lambda p: RouteOptimizer.astar_search(p, 'euclidean'),
+        "astar_manhattan": lambda p: RouteOptimizer.astar_search(p, 'manhattan'),
+        "astar_min_graph": lambda p: RouteOptimizer.astar_search(p, 'min_graph'),
+        "astar_weighted": lambda p: RouteOptimizer.astar_search(p, 'weighted'),
+        "greedy": lambda p: RouteOptimizer.greedy_best_first_search(p),
+        "dfs": lambda p: RouteOptimizer.depth_first_search(p),
+    }
+    
     @staticmethod
     def _extract_path(node):
         """
@@ -94,7 +142,7 @@ class RouteOptimizer:
         while current:
             path.append(current.state)
             current = current.parent
-        return list(reversed(path))
+        return path[::-1]
     
     @staticmethod
     def uniform_cost_search(problem):
@@ -104,13 +152,16 @@ class RouteOptimizer:
         Expands the node with the lowest path cost first.
         Guarantees finding the optimal path.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        # Use professor's UCS function with instrumentation
-        instrumented_problem = InstrumentedProblem(problem)
-        result_node = uniform_cost_search(instrumented_problem, display=False)
+        # Professor's UCS (see _best_first_graph_search) with instrumentation
+        instrumented_problem = CountingProblem(problem)
+        result_node = RouteOptimizer._best_first_graph_search(
+            instrumented_problem,
+            lambda node: node.path_cost
+        )
         
-        elapsed = (time.time() - start_time) * 1000
+        elapsed = (time.perf_counter_ns() - start_ns) / 1_000_000
         
         if result_node:
             path = RouteOptimizer._extract_path(result_node)
@@ -141,7 +192,7 @@ class RouteOptimizer:
         and h(n) is heuristic estimate.
         Guarantees finding the optimal path if heuristic is admissible.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         # Select heuristic function
         heuristic_map = {
             'haversine': lambda node: problem.h(node),
@@ -152,11 +203,14 @@ class RouteOptimizer:
         }
         h_func = heuristic_map.get(heuristic_name, heuristic_map['haversine'])
     
-        # Use professor's A* function with instrumentation
-        instrumented_problem = InstrumentedProblem(problem)
-        result_node = astar_search(instrumented_problem, h=h_func, display=False)
+        # Professor's A* (see _best_first_graph_search) with instrumentation
+        instrumented_problem = CountingProblem(problem)
+        result_node = RouteOptimizer._best_first_graph_search(
+            instrumented_problem,
+            lambda node: node.path_cost + h_func(node)
+        )
         
-        elapsed = (time.time() - start_time) * 1000
+        elapsed = (time.perf_counter_ns() - start_ns) / 1_000_000
         
         if result_node:
             path = RouteOptimizer._extract_path(result_node)
@@ -186,18 +240,17 @@ class RouteOptimizer:
         Expands nodes based solely on h(n), the heuristic estimate.
         Faster than A* but does NOT guarantee optimal path.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        # Use professor's Greedy function with instrumentation
-        # greedy_best_first_graph_search is an alias for best_first_graph_search with f=h
-        instrumented_problem = InstrumentedProblem(problem)
-        result_node = greedy_best_first_graph_search(
+        # Professor's Greedy (see _best_first_graph_search) with instrumentation
+        # greedy_best_first_graph_search is best_first_graph_search with f=h
+        instrumented_problem = CountingProblem(problem)
+        result_node = RouteOptimizer._best_first_graph_search(
             instrumented_problem, 
-            lambda node: problem.h(node), #← This IS minimizing h(n)
-            display=False
+            lambda node: problem.h(node) #← This IS minimizing h(n)
         )
         
-        elapsed = (time.time() - start_time) * 1000
+        elapsed = (time.perf_counter_ns() - start_ns) / 1_000_000
         
         if result_node:
             path = RouteOptimizer._extract_path(result_node)
@@ -219,6 +272,62 @@ class RouteOptimizer:
                 success=False
             )
     
+    @staticmethod
+    def _best_first_graph_search(problem, f):
+        """
+        search.best_first_graph_search on a plain heapq list with lazy deletion.
+        
+        The framework's PriorityQueue scans the whole heap to test whether a
+        child is already on the frontier and re-heapifies to replace it.
+        Here the best f queued for each state is kept in a dict instead: a
+        cheaper path to a queued state is simply pushed again, and the
+        outdated entry is skipped when it is popped after that state has
+        been explored. A running counter breaks ties between equal f values,
+        so Node objects are never compared.
+        """
+        tie = count()
+        node = Node(problem.initial)
+        best_f = {node.state: f(node)}
+        frontier = [(best_f[node.state], next(tie), node)]
+        explored = set()
+        while frontier:
+            _, _, node = heapq.heappop(frontier)
+            if node.state in explored:
+                continue
+            if problem.goal_test(node.state):
+                return node
+            explored.add(node.state)
+            for child in node.expand(problem):
+                if child.state in explored:
+                    continue
+                child_f = f(child)
+                if child_f < best_f.get(child.state, float('inf')):
+                    best_f[child.state] = child_f
+                    heapq.heappush(frontier, (child_f, next(tie), child))
+        return None
+    
+    @staticmethod
+    def _depth_first_graph_search(problem):
+        """
+        search.depth_first_graph_search with the same expansion order, but the
+        states on the stack are also kept in a set, so checking a child
+        against the frontier is O(1) instead of a scan of the whole stack.
+        """
+        frontier = [Node(problem.initial)]  # Stack
+        on_frontier = {problem.initial}
+        explored = set()
+        while frontier:
+            node = frontier.pop()
+            on_frontier.discard(node.state)
+            if problem.goal_test(node.state):
+                return node
+            explored.add(node.state)
+            for child in node.expand(problem):
+                if child.state not in explored and child.state not in on_frontier:
+                    frontier.append(child)
+                    on_frontier.add(child.state)
+        return None
+    
     @staticmethod
     def depth_first_search(problem):
         """
@@ -228,15 +337,15 @@ class RouteOptimizer:
         Very fast but does NOT guarantee optimal path.
         May find very long paths.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        # Use professor's DFS function with instrumentation
-        instrumented_problem = InstrumentedProblem(problem)
-        result_node = depth_first_graph_search(
+        # Professor's DFS (see _depth_first_graph_search) with instrumentation
+        instrumented_problem = CountingProblem(problem)
+        result_node = RouteOptimizer._depth_first_graph_search(
             instrumented_problem
         )
         
-        elapsed = (time.time() - start_time) * 1000
+        elapsed = (time.perf_counter_ns() - start_ns) / 1_000_000
         
         if result_node:
             path = RouteOptimizer._extract_path(result_node)
@@ -258,23 +367,159 @@ class RouteOptimizer:
                 success=False
             )
     @staticmethod
+    def shortest_paths_from(origin, city_graph):
+        """
+        Single-source Dijkstra from origin over the graph's CSR arrays.
+        
+        One run gives the shortest distance to every reachable city, so
+        queries sharing an origin need no further searches.
+        
+        Args:
+            origin: Starting city name
+            city_graph: Initialized CityGraph object
+        
+        Returns:
+            (dist, parent, order): dicts keyed by node id (see CityGraph.node_id)
+            of every reachable node's distance in miles and predecessor id (-1
+            for the origin), and the node ids in the order they were settled;
+            all empty if origin has no edges
+        """
+        source = city_graph.node_id(origin)
+        if source is None:
+            return {}, {}, []
+        dist = {source: 0.0}
+        parent = {source: -1}
+        done = set()
+        order = []
+        frontier = [(0.0, source)]
+        while frontier:
+            cost, u = heapq.heappop(frontier)
+            if u in done:
+                continue
+            done.add(u)
+            order.append(u)
+            neighbors, weights = city_graph.get_neighbors_ids(u)
+            for v, w in zip(neighbors.tolist(), weights.tolist()):
+                new_cost = cost + w
+                if new_cost < dist.get(v, float('inf')):
+                    dist[v] = new_cost
+                    parent[v] = u
+                    heapq.heappush(frontier, (new_cost, v))
+        return dist, parent, order
+    
+    @staticmethod
+    def dijkstra_search(problem, shortest_paths=None):
+        """
+        Answer a problem from a Dijkstra shortest-path tree rooted at its initial city.
+        
+        Statistics match the other algorithms': a search stopping at the goal
+        expands the nodes settled before it, so nodes_expanded counts the
+        successors those nodes generate and expanded_states lists them in
+        settling order.
+        
+        Args:
+            problem: RouteOptimizationProblem
+            shortest_paths: (dist, parent, order) from shortest_paths_from(problem.initial, ...),
+                to reuse one tree for several goals; computed here if None
+        """
+        start_ns = time.perf_counter_ns()
+        
+        graph = problem.graph
+        if shortest_paths is None:
+            shortest_paths = RouteOptimizer.shortest_paths_from(problem.initial, graph)
+        dist, parent, order = shortest_paths
+        goal_id = graph.node_id(problem.goal)
+        
+        # Without a path every reachable node is expanded before giving up
+        settled = order[:order.index(goal_id)] if goal_id in dist else order
+        nodes_expanded = sum(len(graph.get_neighbors_ids(u)[0]) for u in settled)
+        expanded_states = [graph.node_name(u) for u in settled]
+        
+        if goal_id in dist:
+            path = []
+            node_id = goal_id
+            while node_id != -1:
+                path.append(graph.node_name(node_id))
+                node_id = parent[node_id]
+            elapsed = (time.perf_counter_ns() - start_ns) / 1_000_000
+            return AlgorithmResult(
+                "Dijkstra",
+                path=path[::-1],
+                path_cost=dist[goal_id],
+                nodes_expanded=nodes_expanded,
+                execution_time_ms=elapsed,
+                success=True,
+                expanded_states=expanded_states
+            )
+        else:
+            elapsed = (time.perf_counter_ns() - start_ns) / 1_000_000
+            return AlgorithmResult(
+                "Dijkstra",
+                nodes_expanded=nodes_expanded,
+                execution_time_ms=elapsed,
+                success=False,
+                expanded_states=expanded_states
+            )
+    
+    @staticmethod
     def run_all_algorithms(initial_city, goal_city, city_graph):
-        """Run all algorithms, creating fresh problem for each."""
-        results = {}
+        """
+        Run all algorithms on one shared problem.
         
-        algorithms = [
-            ("ucs", lambda p: RouteOptimizer.uniform_cost_search(p)),
-            ("astar_haversine", lambda p: RouteOptimizer.astar_search(p, 'haversine')),
-            ("astar_euclidean", lambda p: RouteOptimizer.astar_search(p, 'euclidean')),
-            ("astar_manhattan", lambda p: RouteOptimizer.astar_search(p, 'manhattan')),
-            ("astar_min_graph", lambda p: RouteOptimizer.astar_search(p, 'min_graph')),
-            ("astar_weighted", lambda p: RouteOptimizer.astar_search(p, 'weighted')),
-            ("greedy", lambda p: RouteOptimizer.greedy_best_first_search(p)),
-            ("dfs", lambda p: RouteOptimizer.depth_first_search(p)),
-        ]
+        The problem itself is stateless (each run wraps it in a fresh
+        CountingProblem for its statistics), so its per-goal heuristic
+        tables are built once rather than once per algorithm. Runs stay
+        sequential: the searches are pure Python and hold the GIL, and
+        running them side by side would distort each one's timing.
+        """
+        return dict(RouteOptimizer.iter_algorithms(initial_city, goal_city, city_graph))
+    
+    @staticmethod
+    def iter_algorithms(initial_city, goal_city, city_graph):
+        """
+        Like run_all_algorithms, but yield each (name, AlgorithmResult) as
+        soon as that algorithm finishes.
+        """
+        problem = RouteOptimizationProblem(initial_city, goal_city, city_graph)
+        for algo_name, algo_func in RouteOptimizer.ALGORITHMS.items():
+            yield algo_name, algo_func(problem)
+    
+    @staticmethod
+    def run_many(pairs, city_graph, algorithms=("astar_haversine",)):
+        """
+        Solve many (initial, goal) queries in one batch.
         
-        for algo_name, algo_func in algorithms:
-            problem = RouteOptimizationProblem(initial_city, goal_city, city_graph)
-            results[algo_name] = algo_func(problem)
+        Heuristic tables depend only on the goal, so they are built once per
+        distinct goal and shared by every query that targets it. Likewise
+        "dijkstra" runs one shortest-path search per distinct origin and
+        answers every query from that origin from its tree.
         
+        Args:
+            pairs: List of (initial_city, goal_city) tuples
+            city_graph: Initialized CityGraph object
+            algorithms: Keys of RouteOptimizer.ALGORITHMS, or "dijkstra", to
+                run for each pair
+        
+        Returns:
+            List aligned with pairs of {algorithm name: AlgorithmResult} dicts
+        """
+        tables = {}
+        trees = {}
+        results = []
+        for initial_city, goal_city in pairs:
+            initial_city = city_graph.resolve_city(initial_city)
+            goal_city = city_graph.resolve_city(goal_city)
+            if goal_city not in tables:
+                tables[goal_city] = RouteOptimizationProblem.heuristic_tables(city_graph, goal_city)
+            problem = RouteOptimizationProblem(initial_city, goal_city, city_graph,
+                                               heuristics=tables[goal_city])
+            pair_results = {}
+            for name in algorithms:
+                if name == "dijkstra":
+                    if initial_city not in trees:
+                        trees[initial_city] = RouteOptimizer.shortest_paths_from(initial_city, city_graph)
+                    pair_results[name] = RouteOptimizer.dijkstra_search(problem, trees[initial_city])
+                else:
+                    pair_results[name] = RouteOptimizer.ALGORITHMS[name](problem)
+            results.append(pair_results)
         return results
\ No newline at end of file
@@ -29,7 +29,7 @@ class RouteOptimizationProblem:
         graph: Reference to the CityGraph object (passed in, not global)
     """
     
-    def __init__(self, initial, goal, graph):
+    def __init__(self, initial, goal, graph, heuristics=None):
         """
         Initialize the route optimization problem.
         
@@ -37,23 +37,56 @@ class RouteOptimizationProblem:
             initial: Starting city name (e.g., "Buffalo")
             goal: Destination city name (e.g., "New York City")
             graph: Initialized CityGraph object
+            heuristics: Tables from heuristic_tables(graph, goal), to share
+                between problems with the same goal; built here if None
         
         Raises:
             ValueError: If cities not found in graph
         """
+        if graph is None:
+            raise ValueError("CityGraph not initialized. Initialize with city_graph = initialize_city_graph()")
+        
+        # Resolve spelling variants ('buffalo, ny') once, so states are stored keys
+        initial = graph.resolve_city(initial)
+        goal = graph.resolve_city(goal)
         self.initial = initial
         self.goal = goal
         self.graph = graph
         
-        if self.graph is None:
-            raise ValueError("CityGraph not initialized. Initialize with city_graph = initialize_city_graph()")
-        
         # Validate cities exist
-        valid_cities = self.graph.get_all_cities()
-        if initial not in valid_cities:
+        if initial not in self.graph:
             raise ValueError(f"Initial city '{initial}' not found in graph")
-        if goal not in valid_cities:
+        if goal not in self.graph:
             raise ValueError(f"Goal city '{goal}' not found in graph")
+        
+        if heuristics is None:
+            heuristics = self.heuristic_tables(graph, goal)
+        self._h_haversine, self._h_euclidean, self._h_manhattan, self._h_weighted = heuristics
+    
+    @staticmethod
+    def heuristic_tables(graph, goal):
+        """
+        Precompute every heuristic's value to goal for all cities in the graph.
+        
+        The goal is fixed for a problem, so each table is computed in one
+        vectorized pass rather than once per node expansion.
+        
+        Args:
+            graph: Initialized CityGraph object
+            goal: Destination city name
+        
+        Returns:
+            Tuple of (haversine, euclidean, manhattan, weighted) dicts mapping
+            city name -> estimated distance to goal in miles
+        """
+        goal = graph.resolve_city(goal)
+        cities = list(graph.get_all_cities())
+        return (
+            dict(zip(cities, graph.haversine_all_to(goal).tolist())),
+            dict(zip(cities, graph.euclidean_matrix(cities, goal).tolist())),
+            dict(zip(cities, graph.manhattan_matrix(cities, goal).tolist())),
+            dict(zip(cities, graph.weighted_matrix(cities, goal).tolist())),
+        )
     
     def actions(self, state):
         """
@@ -65,10 +98,9 @@ class RouteOptimizationProblem:
             state: Current city name (string)
         
         Returns:
-            List of neighboring city names (strings)
+            Tuple of neighboring city names (strings)
         """
-        neighbors = self.graph.get_neighbors(state)
-        return list(neighbors.keys())
+        return self.graph.get_neighbor_names(state)
     
     def result(self, state, action):
         """
@@ -133,14 +165,23 @@ class RouteOptimizationProblem:
             Estimated distance to goal in miles (float)
         """
         # node.state is the current city
-        return self.graph.haversine_distance(node.state, self.goal)
+        h = self._h_haversine.get(node.state)
+        if h is None:
+            return self.graph.haversine_distance(node.state, self.goal)
+        return h
     def h_euclidean(self, node):
         """Euclidean distance heuristic"""
-        return self.graph.euclidean_distance(node.state, self.goal)
+        h = self._h_euclidean.get(node.state)
+        if h is None:
+            return self.graph.euclidean_distance(node.state, self.goal)
+        return h
     
     def h_manhattan(self, node):
         """Manhattan distance heuristic"""
-        return self.graph.manhattan_distance(node.state, self.goal)
+        h = self._h_manhattan.get(node.state)
+        if h is None:
+            return self.graph.manhattan_distance(node.state, self.goal)
+        return h
     
     def h_min_graph(self, node):
         """Minimum graph distance heuristic"""
@@ -148,7 +189,10 @@ class RouteOptimizationProblem:
     
     def h_weighted(self, node):
         """Weighted combination heuristic"""
-        return self.graph.weighted_heuristic(node.state, self.goal)
+        h = self._h_weighted.get(node.state)
+        if h is None:
+            return self.graph.weighted_heuristic(node.state, self.goal)
+        return h
     
     def __repr__(self):
         """String representation for debugging."""
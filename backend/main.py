@@ -1,9 +1,14 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict
 import sys
 import os
+import json
+import queue
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -45,6 +50,40 @@ origins = [
     "https://routing-intelligence-frontend.onrender.com" 
 ]
 
+# Intermediate cities searched for between the two cities of a route
+NUM_INTERMEDIATE = 25
+
+# Routes whose networks are built at startup (the frontend's default route),
+# so their first /routes request is served from the graph and API caches
+WARMUP_ROUTES = [
+    ("Potsdam, NY", "Austin, TX"),
+]
+
+
+def warm_up_routes():
+    """Build the WARMUP_ROUTES networks ahead of their first request."""
+    for start, goal in WARMUP_ROUTES:
+        try:
+            city_graph.build_dynamic_network(start, goal, num_intermediate=NUM_INTERMEDIATE)
+            print(f"✓ Warmed up {start} → {goal}")
+        except Exception as e:
+            print(f"✗ Error warming up {start} → {goal}: {e}")
+
+
+@app.on_event("startup")
+def start_warm_up():
+    """Warm up popular routes in the background, so startup isn't delayed."""
+    if city_graph is not None:
+        threading.Thread(target=warm_up_routes, daemon=True).start()
+
+
+@app.on_event("shutdown")
+def save_city_graph():
+    """Fold the graph built up while serving into the on-disk snapshot."""
+    if city_graph is not None:
+        city_graph.save_cache()
+
+
 app.add_middleware(
     CORSMiddleware,
     # Use the defined list of origins
@@ -92,18 +131,12 @@ class RouteResponse(BaseModel):
 
 
 # Helper functions
-def get_city_coordinates(city_name: str) -> Dict[str, float]:
-    """Get lat/lon coordinates for a city."""
-    lat, lon = city_graph.get_coordinates(city_name)
-    return {"lat": lat, "lon": lon}
-
-
-def get_path_coordinates(path: List[str]) -> List[Dict[str, float]]:
-    """Convert path of city names to list of coordinates."""
-    coordinates = []
-    for city in path:
+def get_coordinates_map(cities) -> Dict[str, Dict[str, float]]:
+    """Get lat/lon coordinates for each distinct city, looked up once."""
+    coordinates = {}
+    for city in set(cities):
         lat, lon = city_graph.get_coordinates(city)
-        coordinates.append({"lat": lat, "lon": lon})
+        coordinates[city] = {"lat": lat, "lon": lon}
     return coordinates
 
 
@@ -142,18 +175,15 @@ def health_check():
 
 
 
-@app.post("/routes", response_model=RouteResponse)
-def find_routes(request: RouteRequest):
+def prepare_route(request: RouteRequest):
     """
-    Find routes between two cities using all three algorithms.
-    
-    Automatically geocodes cities if they don't exist yet.
-    
-    Args:
-        request: RouteRequest with initial_city and goal_city
+    Resolve the request's cities, geocoding any the graph doesn't know yet.
     
     Returns:
-        RouteResponse with results from all three algorithms
+        (initial_city, goal_city) as stored in the graph
+    
+    Raises:
+        HTTPException: If the graph is not initialized or a city can't be used
     """
     if city_graph is None:
         raise HTTPException(
@@ -161,8 +191,8 @@ def find_routes(request: RouteRequest):
             detail="City graph not initialized. Set GOOGLE_MAPS_API_KEY environment variable."
         )
     
-    initial_city = request.initial_city.strip()
-    goal_city = request.goal_city.strip()
+    initial_city = city_graph.resolve_city(request.initial_city.strip())
+    goal_city = city_graph.resolve_city(request.goal_city.strip())
     
     if initial_city == goal_city:
         raise HTTPException(
@@ -171,67 +201,160 @@ def find_routes(request: RouteRequest):
         )
     
     try:
-        if initial_city not in city_graph.get_all_cities():
+        if initial_city not in city_graph:
             print(f"Geocoding {initial_city}...")
             city_graph.add_city(initial_city)
-        if goal_city not in city_graph.get_all_cities():
+        if goal_city not in city_graph:
             print(f"Geocoding {goal_city}...")
             city_graph.add_city(goal_city)
-        
-        # Verify cities were added successfully
-        if initial_city not in city_graph.get_all_cities():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Could not find coordinates for '{initial_city}'",
-            )
-        if goal_city not in city_graph.get_all_cities():
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Could not find coordinates for '{goal_city}'"
-            )
-        
-        # Build dynamic network between cities
-        print(f"\nBuilding network for {initial_city} → {goal_city}...")
-        all_cities, intermediate_cities = city_graph.build_dynamic_network(initial_city, goal_city, num_intermediate=25)  # CAPTURE intermediate_cities
-        print(f'intermediate cities= {len(intermediate_cities)}')   
-        # print(f'intermediate cities list= {intermediate_cities}') 
-        results = RouteOptimizer.run_all_algorithms(initial_city, goal_city, city_graph)
-        # for algo_key, algo_result in results.items():
-        #     print(f"\n{algo_key.upper()}:")
-        #     print(f"  Path: {algo_result.path}")
-        #     print(f"  Expanded States: {algo_result.expanded_states}")
-        #     print(f"  Nodes Expanded: {algo_result.nodes_expanded}")
-        
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing route: {str(e)}"
         )
     
-    # Format results
-    formatted_results = {}
-    for algo_key, algo_result in results.items():
-        formatted_results[algo_key] = PathResult(
-            algorithm=algo_result.algorithm_name,
-            path=algo_result.path,
-            total_distance=algo_result.path_cost,
-            nodes_expanded=algo_result.nodes_expanded,
-            execution_time_ms=algo_result.execution_time_ms,
-            success=algo_result.success,
-            path_coordinates=get_path_coordinates(algo_result.path),
-            expanded_states=algo_result.expanded_states
+    # Verify cities were added successfully
+    if initial_city not in city_graph:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not find coordinates for '{initial_city}'",
+        )
+    if goal_city not in city_graph:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Could not find coordinates for '{goal_city}'"
+        )
+    return initial_city, goal_city
+
+
+def build_network(initial_city: str, goal_city: str) -> List[str]:
+    """
+    Build the dynamic network between two cities; returns its intermediate cities.
+    
+    API calls run without holding city_graph.lock (which is only taken while
+    cities and edges are inserted), so concurrent builds and searches for
+    other routes are not held up by network I/O.
+    """
+    print(f"\nBuilding network for {initial_city} → {goal_city}...")
+    try:
+        all_cities, intermediate_cities = city_graph.build_dynamic_network(initial_city, goal_city, num_intermediate=NUM_INTERMEDIATE)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing route: {str(e)}"
+        )
+    print(f'intermediate cities= {len(intermediate_cities)}')
+    return intermediate_cities
+
+
+def to_path_result(algo_result, coordinates) -> PathResult:
+    """Format an AlgorithmResult, given coordinates for every city on its path."""
+    return PathResult(
+        algorithm=algo_result.algorithm_name,
+        path=algo_result.path,
+        total_distance=algo_result.path_cost,
+        nodes_expanded=algo_result.nodes_expanded,
+        execution_time_ms=algo_result.execution_time_ms,
+        success=algo_result.success,
+        path_coordinates=[coordinates[city] for city in algo_result.path],
+        expanded_states=algo_result.expanded_states
+    )
+
+
+@app.post("/routes", response_model=RouteResponse)
+def find_routes(request: RouteRequest):
+    """
+    Find routes between two cities using all three algorithms.
+    
+    Automatically geocodes cities if they don't exist yet.
+    
+    Args:
+        request: RouteRequest with initial_city and goal_city
+    
+    Returns:
+        RouteResponse with results from all three algorithms
+    """
+    initial_city, goal_city = prepare_route(request)
+    intermediate_cities = build_network(initial_city, goal_city)
+    
+    try:
+        # Hold the graph lock once for the CSR rebuild and every search, so
+        # edges inserted by concurrent builds can't change the graph mid-search
+        with city_graph.lock:
+            results = RouteOptimizer.run_all_algorithms(initial_city, goal_city, city_graph)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing route: {str(e)}"
         )
+    
+    # Format results; paths share most cities, so coordinates are looked up once
+    coordinates = get_coordinates_map(
+        [initial_city, goal_city] + [city for algo_result in results.values() for city in algo_result.path]
+    )
+    formatted_results = {
+        algo_key: to_path_result(algo_result, coordinates)
+        for algo_key, algo_result in results.items()
+    }
     return RouteResponse(
         initial_city=initial_city,
         goal_city=goal_city,
-        initial_coordinates=get_city_coordinates(initial_city),
-        goal_coordinates=get_city_coordinates(goal_city),
+        initial_coordinates=coordinates[initial_city],
+        goal_coordinates=coordinates[goal_city],
         results=formatted_results,
         intermediate_cities=intermediate_cities  # ADD THIS LINE
     )
 
+
+@app.post("/routes/stream")
+def stream_routes(request: RouteRequest):
+    """
+    Like /routes, but stream newline-delimited JSON as each algorithm finishes,
+    so a client can draw the first path without waiting for the slowest search.
+    
+    The first line holds the RouteResponse fields except results; each
+    following line is {"algorithm_key": ..., "result": PathResult}. An
+    {"error": ...} line ends the stream if a search fails after it started.
+    """
+    initial_city, goal_city = prepare_route(request)
+    intermediate_cities = build_network(initial_city, goal_city)
+    coordinates = get_coordinates_map([initial_city, goal_city])
+    
+    def lines():
+        yield json.dumps({
+            "initial_city": initial_city,
+            "goal_city": goal_city,
+            "initial_coordinates": coordinates[initial_city],
+            "goal_coordinates": coordinates[goal_city],
+            "intermediate_cities": intermediate_cities,
+        }) + "\n"
+        # The searches run on their own thread under one graph-lock acquisition
+        # and hand results over as they finish; yielding never holds the lock,
+        # so a slow client can't stall other requests or network builds
+        finished = queue.Queue()
+        
+        def search():
+            try:
+                with city_graph.lock:
+                    for item in RouteOptimizer.iter_algorithms(initial_city, goal_city, city_graph):
+                        finished.put(item)
+            except Exception as e:
+                finished.put(e)
+            finished.put(None)
+        
+        threading.Thread(target=search, daemon=True).start()
+        for item in iter(finished.get, None):
+            if isinstance(item, Exception):
+                yield json.dumps({"error": f"Error processing route: {str(item)}"}) + "\n"
+                continue
+            algo_key, algo_result = item
+            result = to_path_result(algo_result, get_coordinates_map(algo_result.path))
+            yield json.dumps({"algorithm_key": algo_key, "result": jsonable_encoder(result)}) + "\n"
+    
+    # Starlette iterates this sync generator in its threadpool
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/routes/{initial}/{goal}")
 def find_routes_get(initial: str, goal: str):
     """
@@ -244,4 +367,13 @@ def find_routes_get(initial: str, goal: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvicorn runs on uvloop and httptools automatically when they are installed.
+    # Each worker process imports this module and builds its own city graph, so
+    # extra workers (WEB_CONCURRENCY) trade memory for concurrent /routes throughput.
+    # They share the snapshot and store files; save_cache merges the others' work.
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    if workers > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers,
+                    app_dir=os.path.dirname(os.path.abspath(__file__)))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -3,8 +3,15 @@ Functions to Generate Analysis Graphs for Algorithm Comparison Project
 Input: CSV with columns [From, To, Algorithm, Distance, Nodes Expanded, Execution Time, Path Length]
 """
 
+import multiprocessing
+import os
+
 import pandas as pd
+import matplotlib
+# Charts are only written to files: skip interactive (Qt/Tk) backend start-up
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import numpy as np
 import seaborn as sns
 
@@ -12,36 +19,104 @@ import seaborn as sns
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# Color per algorithm family, matched by substring of the algorithm name
+COLOR_MAP = {'A*': '#2ecc71', 'DFS': '#e74c3c', 'Greedy': '#f39c12', 'UCS': '#3498db'}
+
+
+def color_for(algo):
+    """Color of the first COLOR_MAP family whose key appears in algo (gray if none)."""
+    return next((color for key, color in COLOR_MAP.items() if key in algo), '#808080')
+
+
+def load_results(csv_file):
+    """
+    Read the results CSV once, to be shared by the plot functions.
+    Adds FromCity/ToCity (city names without state) and a 'From → To' Route label.
+    Plot functions take this DataFrame and never modify it.
+    """
+    df = pd.read_csv(csv_file)
+    df['FromCity'] = df['From'].str.split(',', n=1).str[0]
+    df['ToCity'] = df['To'].str.split(',', n=1).str[0]
+    df['Route'] = df['FromCity'] + ' → ' + df['ToCity']
+    return df
+
+
+def chart_subplots(nrows=1, ncols=1, figsize=None, layout=None):
+    """
+    Like plt.subplots, but reuses one pyplot figure per (figsize, layout):
+    the figure is cleared and refilled instead of allocating a new figure
+    and Agg canvas for every chart. Figures stay open until closed by the caller.
+    """
+    num = f'chart {figsize[0]}x{figsize[1]} {layout or "tight"}'
+    fig = plt.figure(num=num, figsize=figsize, layout=layout, clear=True)
+    return fig, fig.subplots(nrows, ncols)
+
+
+def marker_groups(df, styles):
+    """
+    Split rows by marker shape, yielding (marker, rows, colors, sizes) with
+    one color and size per row.
+    styles maps algorithm -> {'color', 'marker', 'size'}; other rows are skipped.
+    """
+    df = df[df['Algorithm'].isin(styles)]
+    markers = pd.Series([styles[algo]['marker'] for algo in df['Algorithm']], index=df.index)
+    
+    for marker, rows in df.groupby(markers, sort=False):
+        row_styles = [styles[algo] for algo in rows['Algorithm']]
+        yield (marker, rows, [style['color'] for style in row_styles],
+               [style['size'] for style in row_styles])
+
+
+def scatter_by_marker(ax, df, x, y, styles, **kwargs):
+    """
+    Scatter df[x] against df[y] with one ax.scatter call per marker shape
+    (color and size vary per point within a call, the marker cannot).
+    Markers are rasterized: vector outputs (PDF/SVG) keep axes and text as
+    vectors but embed the points as one image instead of a path per marker.
+    """
+    for marker, rows, colors, sizes in marker_groups(df, styles):
+        ax.scatter(rows[x].to_numpy(), rows[y].to_numpy(), marker=marker,
+                  c=colors, s=sizes, rasterized=True, **kwargs)
+
+
+def legend_handles(styles, algorithms, edgewidth=1.5):
+    """
+    Legend proxies for scatter_by_marker: one per distinct non-empty label
+    (style 'label', else the algorithm name) among the given algorithms.
+    """
+    handles, seen = [], set()
+    for algo, style in styles.items():
+        label = style.get('label', algo)
+        if algo not in algorithms or not label or label in seen:
+            continue
+        seen.add(label)
+        handles.append(Line2D([0], [0], marker=style['marker'], color='w', markerfacecolor=style['color'],
+                              markersize=np.sqrt(style['size']), markeredgecolor='black',
+                              markeredgewidth=edgewidth, alpha=0.7, label=label))
+    return handles
+
+
 # ============================================================================
 # ANALYSIS 1: Nodes Expanded vs Distance (Line Chart)
 # ============================================================================
 
-def plot_nodes_vs_distance(csv_file):
+def plot_nodes_vs_distance(df, dpi=150):
     """
     Plot: How many nodes does each algorithm explore as distance increases?
     X-axis: Distance categories (Short/Medium/Long)
     Y-axis: Average nodes expanded
     Lines: One per algorithm
     """
-    df = pd.read_csv(csv_file)
-    
-    # Define distance categories
-    
-    def categorize_distance(distance):
-        if distance>0 and distance < 500:
-            return "Short (<500 mi)"
-        elif distance>500 and distance < 1200:
-            return "Medium (500-1200 mi)"
-        else:
-            return "Long from 1600mi"
-    
-    df['Distance Category'] = df['Distance'].apply(categorize_distance)
+    # Define distance categories: [0, 500), [500, 1200), [1200, inf)
+    category = pd.cut(df['Distance'], bins=[0, 500, 1200, np.inf], right=False,
+                      labels=['Short (<500 mi)', 'Medium (500-1200 mi)', 'Long (>1200 mi)'])
     
     # Calculate average nodes per algorithm per distance category
-    grouped = df.groupby(['Distance Category', 'Algorithm'])['Nodes Expanded'].mean().reset_index()
+    grouped = (df.groupby([category.rename('Distance Category'), 'Algorithm'], observed=True)['Nodes Expanded']
+               .mean().reset_index())
     
     # Create plot
-    plt.figure(figsize=(12, 6))
+    chart_subplots(figsize=(12, 6))
     
     for algo in grouped['Algorithm'].unique():
         data = grouped[grouped['Algorithm'] == algo]
@@ -55,7 +130,7 @@ def plot_nodes_vs_distance(csv_file):
     plt.legend(loc='best', fontsize=10)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('1_nodes_vs_distance.png', dpi=300, bbox_inches='tight')
+    plt.savefig('1_nodes_vs_distance.png', dpi=dpi)
     print("✅ Chart 1 saved: 1_nodes_vs_distance.png")
     # plt.show()
 
@@ -64,22 +139,19 @@ def plot_nodes_vs_distance(csv_file):
 # ANALYSIS 2: Average Nodes Expanded (All Routes) - Bar Chart
 # ============================================================================
 
-def plot_average_nodes_all_routes(csv_file):
+def plot_average_nodes_all_routes(df, dpi=150):
     """
     Plot: Which algorithm explores least nodes on average (across all 12 routes)?
     X-axis: Algorithms (sorted by efficiency)
     Y-axis: Average nodes expanded
     """
-    df = pd.read_csv(csv_file)
-    
     # Calculate average nodes per algorithm
     avg_nodes = df.groupby('Algorithm')['Nodes Expanded'].mean().sort_values()
     
     # Create plot
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = chart_subplots(figsize=(12, 6))
     
-    colors = ['#2ecc71' if 'A*' in algo else '#e74c3c' if 'DFS' in algo else '#f39c12' 
-              if 'Greedy' in algo else '#3498db' for algo in avg_nodes.index]
+    colors = [color_for(algo) for algo in avg_nodes.index]
     
     bars = ax.barh(range(len(avg_nodes)), avg_nodes.values, color=colors, edgecolor='black', linewidth=1.5)
     
@@ -95,7 +167,7 @@ def plot_average_nodes_all_routes(csv_file):
     ax.grid(axis='x', alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('2_average_nodes_all_routes.png', dpi=300, bbox_inches='tight')
+    plt.savefig('2_average_nodes_all_routes.png', dpi=dpi)
     print("✅ Chart 2 saved: 2_average_nodes_all_routes.png")
     # plt.show()
 
@@ -104,19 +176,17 @@ def plot_average_nodes_all_routes(csv_file):
 # ANALYSIS 3: A* Heuristics Comparison - Why Euclidean Wins
 # ============================================================================
 
-def plot_astar_heuristics_comparison(csv_file):
+def plot_astar_heuristics_comparison(df, dpi=150):
     """
     Plot: Compare A* variants (Haversine, Euclidean, Manhattan, Min Graph, Weighted)
     Which heuristic is smartest?
     """
-    df = pd.read_csv(csv_file)
-    
     # Filter only A* algorithms
     astar_algos = df[df['Algorithm'].str.contains('A*')]
     avg_nodes = astar_algos.groupby('Algorithm')['Nodes Expanded'].mean().sort_values()
     
     # Create plot
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = chart_subplots(figsize=(12, 6))
     
     # Color Euclidean differently (winner)
     colors = ['#2ecc71' if 'Euclidean' in algo else '#3498db' for algo in avg_nodes.index]
@@ -138,7 +208,7 @@ def plot_astar_heuristics_comparison(csv_file):
     ax.grid(axis='y', alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('3_astar_heuristics_comparison.png', dpi=300, bbox_inches='tight')
+    plt.savefig('3_astar_heuristics_comparison.png', dpi=dpi)
     print("✅ Chart 3 saved: 3_astar_heuristics_comparison.png")
     # plt.show()
 
@@ -147,12 +217,10 @@ def plot_astar_heuristics_comparison(csv_file):
 # ANALYSIS 4: Informed vs Uninformed - Gap Visualization
 # ============================================================================
 
-def plot_informed_vs_uninformed(csv_file):
+def plot_informed_vs_uninformed(df, dpi=150):
     """
     Plot: Show the gap between informed (A*) and uninformed (UCS/DFS) algorithms
     """
-    df = pd.read_csv(csv_file)
-    
     # Categorize algorithms
     astar_algos = df[df['Algorithm'].str.contains('A*')].groupby('Algorithm')['Nodes Expanded'].mean()
     ucs = df[df['Algorithm'] == 'UCS (Dijkstra)']['Nodes Expanded'].mean()
@@ -160,7 +228,7 @@ def plot_informed_vs_uninformed(csv_file):
     greedy = df[df['Algorithm'] == 'Greedy Best-First']['Nodes Expanded'].mean()
     
     # Create plot
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = chart_subplots(figsize=(12, 6))
     
     categories = ['Informed\n(A* Variants)', 'Uninformed\n(UCS)', 'Other\n(Greedy)', 'Other\n(DFS)']
     values = [astar_algos.mean(), ucs, greedy, dfs]
@@ -186,7 +254,7 @@ def plot_informed_vs_uninformed(csv_file):
             bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7))
     
     plt.tight_layout()
-    plt.savefig('4_informed_vs_uninformed.png', dpi=300, bbox_inches='tight')
+    plt.savefig('4_informed_vs_uninformed.png', dpi=dpi)
     print("✅ Chart 4 saved: 4_informed_vs_uninformed.png")
     # plt.show()
 
@@ -195,32 +263,34 @@ def plot_informed_vs_uninformed(csv_file):
 # ANALYSIS 5: All 12 Routes - Detailed Breakdown
 # ============================================================================
 
-def plot_all_routes_detailed(csv_file):
+def plot_all_routes_detailed(df, dpi=150):
     """
     Plot: Show nodes expanded for each individual route
     Group by route, show bars for UCS, A*(Euclidean), Greedy
     """
-    df = pd.read_csv(csv_file)
-    
-    # Create route label
-    df['Route'] = df['From'].str.split(',').str[0] + '\n→\n' + df['To'].str.split(',').str[0]
+    # Create route label (stacked over three lines for the x-axis)
+    df = df.assign(Route=df['FromCity'] + '\n→\n' + df['ToCity'])
     
     # Filter algorithms of interest
     algos_to_plot = ['UCS (Dijkstra)', 'A* (Euclidean)', 'Greedy Best-First']
     df_filtered = df[df['Algorithm'].isin(algos_to_plot)]
     
     # Create plot
-    fig, ax = plt.subplots(figsize=(16, 8))
+    fig, ax = chart_subplots(figsize=(16, 8))
     
     routes = df_filtered['Route'].unique()
     x = np.arange(len(routes))
     width = 0.25
     
+    # One route x algorithm table (first row per cell, 0 where missing)
+    # instead of a boolean-mask scan of the whole frame for every bar
+    nodes = (df_filtered.pivot_table(index='Route', columns='Algorithm', values='Nodes Expanded', aggfunc='first')
+             .reindex(index=routes, columns=algos_to_plot)
+             .fillna(0))
+    
     for i, algo in enumerate(algos_to_plot):
-        values = [df_filtered[(df_filtered['Route'] == route) & (df_filtered['Algorithm'] == algo)]['Nodes Expanded'].values[0] 
-                  if len(df_filtered[(df_filtered['Route'] == route) & (df_filtered['Algorithm'] == algo)]) > 0 else 0 
-                  for route in routes]
-        ax.bar(x + i*width, values, width, label=algo, edgecolor='black', linewidth=1)
+        ax.bar(x + i*width, nodes[algo].to_numpy(), width, label=algo, edgecolor='black', linewidth=1,
+               rasterized=True)
     
     ax.set_xlabel('Route', fontsize=12, fontweight='bold')
     ax.set_ylabel('Nodes Expanded', fontsize=12, fontweight='bold')
@@ -232,7 +302,7 @@ def plot_all_routes_detailed(csv_file):
     ax.grid(axis='y', alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('5_all_routes_detailed.png', dpi=300, bbox_inches='tight')
+    plt.savefig('5_all_routes_detailed.png', dpi=dpi)
     print("✅ Chart 5 saved: 5_all_routes_detailed.png")
     # plt.show()
 
@@ -241,39 +311,28 @@ def plot_all_routes_detailed(csv_file):
 # ANALYSIS 6: Greedy Trade-off (Speed vs Quality)
 # ============================================================================
 
-def plot_greedy_tradeoff(csv_file):
+def plot_greedy_tradeoff(df, dpi=150):
     """
     Plot: Greedy finds paths fast but are they optimal?
     X-axis: Nodes Expanded (speed)
     Y-axis: Path Distance (quality)
     """
-    df = pd.read_csv(csv_file)
+    fig, ax = chart_subplots(figsize=(12, 7))
     
-    # Get data for each route
-    routes = df['From'].str.split(',').str[0] + ' → ' + df['To'].str.split(',').str[0]
-    df['Route'] = routes
+    # One point per route and algorithm (first run of each)
+    df = df.drop_duplicates(subset=['Route', 'Algorithm'])
     
-    fig, ax = plt.subplots(figsize=(12, 7))
-    
-    # Group by route and algorithm
-    for route in df['Route'].unique():
-        route_data = df[df['Route'] == route]
-        
-        ucs_data = route_data[route_data['Algorithm'] == 'UCS (Dijkstra)']
-        greedy_data = route_data[route_data['Algorithm'] == 'Greedy Best-First']
-        astar_data = route_data[route_data['Algorithm'] == 'A* (Euclidean)']
-        
-        if len(ucs_data) > 0:
-            ax.scatter(ucs_data['Nodes Expanded'].values[0], ucs_data['Distance'].values[0], 
-                      s=150, color='#3498db', marker='o', edgecolor='black', linewidth=1.5, alpha=0.7, label='UCS' if route == df['Route'].unique()[0] else '')
-        
-        if len(greedy_data) > 0:
-            ax.scatter(greedy_data['Nodes Expanded'].values[0], greedy_data['Distance'].values[0], 
-                      s=150, color='#f39c12', marker='^', edgecolor='black', linewidth=1.5, alpha=0.7, label='Greedy' if route == df['Route'].unique()[0] else '')
-        
-        if len(astar_data) > 0:
-            ax.scatter(astar_data['Nodes Expanded'].values[0], astar_data['Distance'].values[0], 
-                      s=150, color='#2ecc71', marker='s', edgecolor='black', linewidth=1.5, alpha=0.7, label='A* (Euclidean)' if route == df['Route'].unique()[0] else '')
+    # One scatter call per algorithm over all of its routes
+    styles = [
+        ('UCS (Dijkstra)', 'UCS', '#3498db', 'o'),
+        ('Greedy Best-First', 'Greedy', '#f39c12', '^'),
+        ('A* (Euclidean)', 'A* (Euclidean)', '#2ecc71', 's'),
+    ]
+    for algo, label, color, marker in styles:
+        algo_data = df[df['Algorithm'] == algo]
+        ax.scatter(algo_data['Nodes Expanded'].to_numpy(), algo_data['Distance'].to_numpy(),
+                  s=150, color=color, marker=marker, edgecolor='black', linewidth=1.5, alpha=0.7, label=label,
+                  rasterized=True)
     
     ax.set_xlabel('Nodes Expanded (Efficiency)', fontsize=12, fontweight='bold')
     ax.set_ylabel('Route Distance (Quality)', fontsize=12, fontweight='bold')
@@ -283,7 +342,7 @@ def plot_greedy_tradeoff(csv_file):
     ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('6_greedy_tradeoff.png', dpi=300, bbox_inches='tight')
+    plt.savefig('6_greedy_tradeoff.png', dpi=dpi)
     print("✅ Chart 6 saved: 6_greedy_tradeoff.png")
     # plt.show()
 
@@ -300,7 +359,7 @@ Shows actual relationship between:
 # VISUALIZATION 1: Nodes vs Execution Time (Efficiency vs Speed)
 # ============================================================================
 
-def plot_nodes_vs_time(csv_file):
+def plot_nodes_vs_time(df, dpi=150):
     """
     Scatter plot showing:
     X-axis: Execution Time (ms)
@@ -309,9 +368,7 @@ def plot_nodes_vs_time(csv_file):
     Each algorithm shown as different color/marker
     Shows: Which is fastest? Which explores least nodes?
     """
-    df = pd.read_csv(csv_file)
-    
-    fig, ax = plt.subplots(figsize=(13, 8))
+    fig, ax = chart_subplots(figsize=(13, 8))
     
     # Define colors and markers for each algorithm type
     algo_styles = {
@@ -325,12 +382,9 @@ def plot_nodes_vs_time(csv_file):
         'DFS': {'color': '#e74c3c', 'marker': 'v', 'size': 120, 'label': 'DFS (Unpredictable)'}
     }
     
-    # Plot each algorithm
-    for algo, style in algo_styles.items():
-        algo_data = df[df['Algorithm'] == algo]
-        ax.scatter(algo_data['Execution Time'], algo_data['Nodes Expanded'],
-                  color=style['color'], marker=style['marker'], s=style['size'],
-                  edgecolor='black', linewidth=1.5, alpha=0.7, label=style['label'], zorder=3)
+    # Plot all algorithms, one scatter call per marker shape
+    scatter_by_marker(ax, df, 'Execution Time', 'Nodes Expanded', algo_styles,
+                      edgecolor='black', linewidth=1.5, alpha=0.7, zorder=3)
     
     # Add quadrant dividers to show trade-offs
     median_time = df['Execution Time'].median()
@@ -356,11 +410,12 @@ def plot_nodes_vs_time(csv_file):
     ax.set_ylabel('Nodes Explored', fontsize=13, fontweight='bold')
     ax.set_title('Speed vs Efficiency Trade-off\nWhich Algorithm is Fastest AND Explores Fewest Nodes?',
                  fontsize=14, fontweight='bold', pad=20)
-    ax.legend(loc='best', fontsize=10, framealpha=0.95)
+    ax.legend(handles=legend_handles(algo_styles, set(df['Algorithm'])),
+             loc='best', fontsize=10, framealpha=0.95)
     ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('8_nodes_vs_time_tradeoff.png', dpi=300, bbox_inches='tight')
+    plt.savefig('8_nodes_vs_time_tradeoff.png', dpi=dpi)
     print("✅ Chart saved: 8_nodes_vs_time_tradeoff.png")
     # plt.show()
 
@@ -369,7 +424,7 @@ def plot_nodes_vs_time(csv_file):
 # VISUALIZATION 2: Path Distance vs Execution Time (Optimality vs Speed)
 # ============================================================================
 
-def plot_distance_vs_time(csv_file):
+def plot_distance_vs_time(df, dpi=150):
     """
     Scatter plot showing:
     X-axis: Execution Time (ms)
@@ -377,9 +432,7 @@ def plot_distance_vs_time(csv_file):
     
     Shows which algorithms find SHORT paths (optimal) vs LONG paths (suboptimal)
     """
-    df = pd.read_csv(csv_file)
-    
-    fig, ax = plt.subplots(figsize=(13, 8))
+    fig, ax = chart_subplots(figsize=(13, 8))
     
     algo_styles = {
         'UCS (Dijkstra)': {'color': '#3498db', 'marker': 'o', 'size': 150, 'label': 'UCS (Optimal)'},
@@ -395,18 +448,9 @@ def plot_distance_vs_time(csv_file):
     # Get optimal distance for reference
     optimal_distances = df[df['Algorithm'] == 'UCS (Dijkstra)'].set_index('From')['Distance'].to_dict()
     
-    # Plot each algorithm
-    plotted_labels = set()
-    for algo, style in algo_styles.items():
-        algo_data = df[df['Algorithm'] == algo]
-        
-        label = style['label'] if style['label'] not in plotted_labels else ''
-        if style['label']:
-            plotted_labels.add(style['label'])
-        
-        ax.scatter(algo_data['Execution Time'], algo_data['Distance'],
-                  color=style['color'], marker=style['marker'], s=style['size'],
-                  edgecolor='black', linewidth=1.5, alpha=0.7, label=label, zorder=3)
+    # Plot all algorithms, one scatter call per marker shape
+    scatter_by_marker(ax, df, 'Execution Time', 'Distance', algo_styles,
+                      edgecolor='black', linewidth=1.5, alpha=0.7, zorder=3)
     
     # Add quadrant dividers
     median_time = df['Execution Time'].median()
@@ -432,11 +476,12 @@ def plot_distance_vs_time(csv_file):
     ax.set_ylabel('Path Distance (miles)', fontsize=13, fontweight='bold')
     ax.set_title('Optimality vs Speed Trade-off\nWhich Algorithms Find Shortest Paths FAST?',
                  fontsize=14, fontweight='bold', pad=20)
-    ax.legend(loc='best', fontsize=10, framealpha=0.95)
+    ax.legend(handles=legend_handles(algo_styles, set(df['Algorithm'])),
+             loc='best', fontsize=10, framealpha=0.95)
     ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('8b_distance_vs_time_tradeoff.png', dpi=300, bbox_inches='tight')
+    plt.savefig('8b_distance_vs_time_tradeoff.png', dpi=dpi)
     print("✅ Chart saved: 8b_distance_vs_time_tradeoff.png")
     
 
@@ -445,16 +490,15 @@ def plot_distance_vs_time(csv_file):
 # VISUALIZATION 3: 3-Way Comparison (Nodes + Time + Distance)
 # ============================================================================
 
-def plot_three_way_comparison(csv_file):
+def plot_three_way_comparison(df, dpi=150):
     """
     Three subplots showing different trade-offs:
     1. Nodes vs Execution Time
     2. Path Distance vs Execution Time  
     3. Nodes vs Path Distance
     """
-    df = pd.read_csv(csv_file)
-    
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    # Constrained layout keeps the suptitle and the legend below the subplots on the canvas
+    fig, axes = chart_subplots(1, 3, figsize=(18, 5), layout='constrained')
     
     algo_colors = {
         'UCS (Dijkstra)': '#3498db',
@@ -478,55 +522,47 @@ def plot_three_way_comparison(csv_file):
         'DFS': 'v'
     }
     
-    # ===== SUBPLOT 1: Nodes vs Time =====
-    for algo in df['Algorithm'].unique():
-        algo_data = df[df['Algorithm'] == algo]
-        axes[0].scatter(algo_data['Execution Time'], algo_data['Nodes Expanded'],
-                       color=algo_colors.get(algo, '#808080'), 
-                       marker=algo_markers.get(algo, 'o'), s=100,
-                       edgecolor='black', linewidth=1, alpha=0.7, label=algo)
+    # Style every algorithm present, in order of first appearance (gray circles if unknown)
+    algo_styles = {algo: {'color': algo_colors.get(algo, '#808080'), 'marker': algo_markers.get(algo, 'o'), 'size': 100}
+                   for algo in df['Algorithm'].unique()}
+    
+    # Group rows by marker and convert each metric to an array once; all three
+    # subplots draw from the same arrays (see scatter_by_marker)
+    for marker, rows, colors, sizes in marker_groups(df, algo_styles):
+        time_ms = rows['Execution Time'].to_numpy()
+        nodes = rows['Nodes Expanded'].to_numpy()
+        distance = rows['Distance'].to_numpy()
+        for ax, x, y in ((axes[0], time_ms, nodes), (axes[1], time_ms, distance), (axes[2], nodes, distance)):
+            ax.scatter(x, y, marker=marker, c=colors, s=sizes,
+                      edgecolor='black', linewidth=1, alpha=0.7, rasterized=True)
     
+    # ===== SUBPLOT 1: Nodes vs Time =====
     axes[0].set_xlabel('Time (ms)', fontsize=11, fontweight='bold')
     axes[0].set_ylabel('Nodes Explored', fontsize=11, fontweight='bold')
     axes[0].set_title('⚡ Speed vs Efficiency', fontsize=12, fontweight='bold')
     axes[0].grid(True, alpha=0.3)
     
     # ===== SUBPLOT 2: Distance vs Time =====
-    for algo in df['Algorithm'].unique():
-        algo_data = df[df['Algorithm'] == algo]
-        axes[1].scatter(algo_data['Execution Time'], algo_data['Distance'],
-                       color=algo_colors.get(algo, '#808080'),
-                       marker=algo_markers.get(algo, 'o'), s=100,
-                       edgecolor='black', linewidth=1, alpha=0.7)
-    
     axes[1].set_xlabel('Time (ms)', fontsize=11, fontweight='bold')
     axes[1].set_ylabel('Path Distance (mi)', fontsize=11, fontweight='bold')
     axes[1].set_title('✅ Speed vs Quality', fontsize=12, fontweight='bold')
     axes[1].grid(True, alpha=0.3)
     
     # ===== SUBPLOT 3: Nodes vs Distance =====
-    for algo in df['Algorithm'].unique():
-        algo_data = df[df['Algorithm'] == algo]
-        axes[2].scatter(algo_data['Nodes Expanded'], algo_data['Distance'],
-                       color=algo_colors.get(algo, '#808080'),
-                       marker=algo_markers.get(algo, 'o'), s=100,
-                       edgecolor='black', linewidth=1, alpha=0.7)
-    
     axes[2].set_xlabel('Nodes Explored', fontsize=11, fontweight='bold')
     axes[2].set_ylabel('Path Distance (mi)', fontsize=11, fontweight='bold')
     axes[2].set_title('🎯 Efficiency vs Quality', fontsize=12, fontweight='bold')
     axes[2].grid(True, alpha=0.3)
     
     fig.suptitle('Three-Way Trade-off Analysis: All Metrics at Once', 
-                 fontsize=15, fontweight='bold', y=1.02)
+                 fontsize=15, fontweight='bold')
     
     # Legend outside the plots
-    handles, labels = axes[0].get_legend_handles_labels()
-    fig.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, -0.02), 
+    handles = legend_handles(algo_styles, algo_styles, edgewidth=1)
+    fig.legend(handles=handles, loc='outside lower center', 
               ncol=4, fontsize=9, framealpha=0.95)
     
-    plt.tight_layout()
-    plt.savefig('8c_three_way_comparison.png', dpi=300, bbox_inches='tight')
+    plt.savefig('8c_three_way_comparison.png', dpi=dpi)
     print("✅ Chart saved: 8c_three_way_comparison.png")
      
 
@@ -535,31 +571,20 @@ def plot_three_way_comparison(csv_file):
 # VISUALIZATION 4: Average Metrics Comparison (Bar + Line Combined)
 # ============================================================================
 
-def plot_average_tradeoff_comparison(csv_file):
+def plot_average_tradeoff_comparison(df, dpi=150):
     """
     Show average metrics for each algorithm type:
     Bars: Nodes Explored
     Line overlay: Execution Time
     """
-    df = pd.read_csv(csv_file)
-    
     # Calculate averages by algorithm
     avg_metrics = df.groupby('Algorithm')[['Nodes Expanded', 'Execution Time', 'Distance']].mean().reset_index()
     avg_metrics = avg_metrics.sort_values('Nodes Expanded')
     
-    fig, ax1 = plt.subplots(figsize=(14, 7))
+    fig, ax1 = chart_subplots(figsize=(14, 7))
     
     # Colors based on algorithm type
-    colors = []
-    for algo in avg_metrics['Algorithm']:
-        if 'A*' in algo:
-            colors.append('#2ecc71')
-        elif 'UCS' in algo:
-            colors.append('#3498db')
-        elif 'Greedy' in algo:
-            colors.append('#f39c12')
-        else:  # DFS
-            colors.append('#e74c3c')
+    colors = [color_for(algo) for algo in avg_metrics['Algorithm']]
     
     x_pos = np.arange(len(avg_metrics))
     
@@ -574,11 +599,7 @@ def plot_average_tradeoff_comparison(csv_file):
     ax1.grid(axis='y', alpha=0.3)
     
     # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height,
-                f'{int(height)}',
-                ha='center', va='bottom', fontweight='bold', fontsize=9)
+    ax1.bar_label(bars, fmt='%d', fontweight='bold', fontsize=9)
     
     # Plot 2: Execution Time (Line on secondary axis)
     ax2 = ax1.twinx()
@@ -588,7 +609,7 @@ def plot_average_tradeoff_comparison(csv_file):
     ax2.tick_params(axis='y', labelcolor='#e74c3c')
     
     # Add value labels on line
-    for i, (x, y) in enumerate(zip(x_pos, avg_metrics['Execution Time'])):
+    for x, y in zip(x_pos, avg_metrics['Execution Time']):
         ax2.text(x, y + 1, f'{y:.2f}ms', ha='center', va='bottom', fontweight='bold', fontsize=9, color='#e74c3c')
     
     fig.suptitle('Average Trade-off: Nodes vs Execution Time', fontsize=14, fontweight='bold', y=0.98)
@@ -599,11 +620,11 @@ def plot_average_tradeoff_comparison(csv_file):
     ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right', fontsize=11)
     
     plt.tight_layout()
-    plt.savefig('8d_average_tradeoff_bars_line.png', dpi=300, bbox_inches='tight')
+    plt.savefig('8d_average_tradeoff_bars_line.png', dpi=dpi)
     print("✅ Chart saved: 8d_average_tradeoff_bars_line.png")
      
 
-def plot_tradeoff_by_distance_category(csv_file):
+def plot_tradeoff_by_distance_category(df, dpi=150):
     """
     Create 3 side-by-side scatter plots:
     - Short routes (200-350 mi)
@@ -612,20 +633,12 @@ def plot_tradeoff_by_distance_category(csv_file):
     
     This shows how algorithms perform differently by distance!
     """
-    df = pd.read_csv(csv_file)
-    
-    # Define distance categories
-    def categorize_distance(distance):
-        if distance < 400:
-            return "Short"
-        elif distance < 700:
-            return "Medium"
-        else:
-            return "Long"
+    # Define distance categories: (-inf, 400), [400, 700), [700, inf)
+    distance_category = pd.cut(df['Distance'], bins=[-np.inf, 400, 700, np.inf], right=False,
+                               labels=['Short', 'Medium', 'Long'])
     
-    df['Distance Category'] = df['Distance'].apply(categorize_distance)
-    
-    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    # Constrained layout keeps the suptitle and the legend below the subplots on the canvas
+    fig, axes = chart_subplots(1, 3, figsize=(18, 6), layout='constrained')
     
     algo_colors = {
         'UCS (Dijkstra)': '#3498db',
@@ -649,19 +662,19 @@ def plot_tradeoff_by_distance_category(csv_file):
         'DFS': 'v'
     }
     
+    # Style every algorithm present (gray circles if unknown)
+    algo_styles = {algo: {'color': algo_colors.get(algo, '#808080'), 'marker': algo_markers.get(algo, 'o'), 'size': 120}
+                   for algo in df['Algorithm'].unique()}
+    
     categories = ['Short', 'Medium', 'Long']
     
     for idx, category in enumerate(categories):
         ax = axes[idx]
-        cat_data = df[df['Distance Category'] == category]
+        cat_data = df[distance_category == category]
         
-        # Plot each algorithm
-        for algo in cat_data['Algorithm'].unique():
-            algo_data = cat_data[cat_data['Algorithm'] == algo]
-            ax.scatter(algo_data['Execution Time'], algo_data['Distance'],
-                      color=algo_colors.get(algo, '#808080'),
-                      marker=algo_markers.get(algo, 'o'),
-                      s=120, edgecolor='black', linewidth=1.5, alpha=0.7)
+        # Plot all algorithms, one scatter call per marker shape
+        scatter_by_marker(ax, cat_data, 'Execution Time', 'Distance', algo_styles,
+                          edgecolor='black', linewidth=1.5, alpha=0.7)
         
         # Add quadrant dividers
         ax.axvline(x=cat_data['Execution Time'].median(), color='gray', 
@@ -676,10 +689,9 @@ def plot_tradeoff_by_distance_category(csv_file):
         ax.grid(True, alpha=0.3)
     
     fig.suptitle('Trade-off Analysis by Distance Category\n(Shows why Greedy/DFS fail on long routes)',
-                fontsize=14, fontweight='bold', y=1.02)
+                fontsize=14, fontweight='bold')
     
     # Add one legend
-    from matplotlib.lines import Line2D
     legend_elements = [
         Line2D([0], [0], marker='o', color='w', markerfacecolor='#3498db', 
                markersize=10, markeredgecolor='black', label='UCS'),
@@ -690,55 +702,66 @@ def plot_tradeoff_by_distance_category(csv_file):
         Line2D([0], [0], marker='v', color='w', markerfacecolor='#e74c3c', 
                markersize=10, markeredgecolor='black', label='DFS'),
     ]
-    fig.legend(handles=legend_elements, loc='upper center', bbox_to_anchor=(0.5, -0.02),
+    fig.legend(handles=legend_elements, loc='outside lower center',
               ncol=4, fontsize=11, framealpha=0.95)
     
-    plt.tight_layout()
-    plt.savefig('9_tradeoff_by_distance_category.png', dpi=300, bbox_inches='tight')
+    plt.savefig('9_tradeoff_by_distance_category.png', dpi=dpi)
     
 
 
 
-def generate_all_charts(csv_file):
+def render_chart(title, plot, data, dpi=150):
     """
-    Generate all 6 analysis charts
+    Draw one chart; run in a pool worker by generate_all_charts.
+    """
+    print(f"\n{title}")
+    plot(data, dpi=dpi)
+    # Drop the chart's artists but keep the figure for the next chart of its size
+    plt.gcf().clear()
+
+
+def generate_all_charts(csv_file, processes=None, dpi=150):
+    """
+    Generate all analysis charts
+    
+    The charts are independent and their PNG encoding dominates, so they
+    are drawn in a pool of worker processes (one per chart, up to the CPU
+    count). processes=1 draws them one after another in this process.
+    Raise dpi (e.g. 300) for print-quality output, lower it for quick drafts.
     """
     print("\n" + "="*70)
     print("GENERATING ANALYSIS CHARTS")
     print("="*70)
     
-    print("\n📊 Generating Chart 1: Nodes vs Distance...")
-    plot_nodes_vs_distance(csv_file)
-    
-    print("\n📊 Generating Chart 2: Average Nodes (All Routes)...")
-    plot_average_nodes_all_routes(csv_file)
-    
-    print("\n📊 Generating Chart 3: A* Heuristics Comparison...")
-    plot_astar_heuristics_comparison(csv_file)
-    
-    print("\n📊 Generating Chart 4: Informed vs Uninformed...")
-    plot_informed_vs_uninformed(csv_file)
-    
-    print("\n📊 Generating Chart 5: All Routes Detailed...")
-    plot_all_routes_detailed(csv_file)
-    
-    print("\n📊 Generating Chart 6: Greedy Trade-off...")
-    plot_greedy_tradeoff(csv_file)
-
-    print("\n📊 Chart 7: Nodes vs Execution Time (Speed & Efficiency)")
-    plot_nodes_vs_time(csv_file)
-    
-    print("\n📊 Chart 8: Path Distance vs Execution Time (Speed & Quality)")
-    plot_distance_vs_time(csv_file)
-    
-    print("\n📊 Chart 9: Three-Way Comparison (All Metrics)")
-    plot_three_way_comparison(csv_file)
+    # Parse the CSV once for every chart
+    df = load_results(csv_file)
+    
+    charts = [
+        ("📊 Generating Chart 1: Nodes vs Distance...", plot_nodes_vs_distance, df),
+        ("📊 Generating Chart 2: Average Nodes (All Routes)...", plot_average_nodes_all_routes, df),
+        ("📊 Generating Chart 3: A* Heuristics Comparison...", plot_astar_heuristics_comparison, df),
+        ("📊 Generating Chart 4: Informed vs Uninformed...", plot_informed_vs_uninformed, df),
+        ("📊 Generating Chart 5: All Routes Detailed...", plot_all_routes_detailed, df),
+        ("📊 Generating Chart 6: Greedy Trade-off...", plot_greedy_tradeoff, df),
+        ("📊 Chart 7: Nodes vs Execution Time (Speed & Efficiency)", plot_nodes_vs_time, df),
+        ("📊 Chart 8: Path Distance vs Execution Time (Speed & Quality)", plot_distance_vs_time, df),
+        ("📊 Chart 9: Three-Way Comparison (All Metrics)", plot_three_way_comparison, df),
+        ("📊 Chart 10: Average Metrics (Bars + Line)", plot_average_tradeoff_comparison, df),
+        ("📊 Chart 11: Trade-off by Distance Category", plot_tradeoff_by_distance_category, df),
+    ]
     
-    print("\n📊 Chart 10: Average Metrics (Bars + Line)")
-    plot_average_tradeoff_comparison(csv_file)
-
-    plot_tradeoff_by_distance_category(csv_file)
-
+    if processes is None:
+        processes = min(len(charts), os.cpu_count() or 1)
+    if processes <= 1:
+        for chart in charts:
+            render_chart(*chart, dpi=dpi)
+        plt.close('all')
+        return
+    
+    # Figures can't cross processes: each worker gets the data and draws (and
+    # reuses) its own; they are released when the pool's workers exit
+    with multiprocessing.Pool(processes) as pool:
+        pool.starmap(render_chart, [chart + (dpi,) for chart in charts])
 
 if __name__ == "__main__":
     # Replace with your actual CSV file path